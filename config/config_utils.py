@@ -6,7 +6,16 @@ import json
 import logging
 import os
 import shutil
-from typing import Dict, Any, Union, List
+from collections import ChainMap
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, Union, List, Tuple
+
+# orjson é opcional: quando disponível, acelera a leitura/escrita do config
+try:
+    import orjson as _json_fast
+except ImportError:
+    _json_fast = None
 
 # Valores padrão para configurações
 DEFAULT_CONFIG = {
@@ -21,6 +30,47 @@ DEFAULT_CONFIG = {
     "log_level": "INFO",
 }
 
+# Visão somente leitura dos padrões (inclusive estruturas aninhadas), usada
+# como última camada do ChainMap: nunca precisa ser copiada
+_DEFAULTS = MappingProxyType({
+    **DEFAULT_CONFIG,
+    "hotkeys": MappingProxyType(DEFAULT_CONFIG["hotkeys"]),
+})
+
+# Caminhos de config já confirmados no local definitivo: outras instâncias
+# de ConfigManager não repetem os os.path.exists() da migração
+_resolved_config_paths: set = set()
+
+
+def _with_defaults(config: Dict[str, Any]) -> ChainMap:
+    """
+    Sobrepõe as configurações do usuário aos valores padrão sem copiá-los.
+    Escritas vão sempre para a camada do usuário (maps[0]).
+    
+    Args:
+        config: Dicionário lido do arquivo JSON
+        
+    Returns:
+        ChainMap com fallback para os valores padrão
+    """
+    # Estruturas aninhadas também recebem sua própria camada de padrões
+    config["hotkeys"] = ChainMap(config.get("hotkeys", {}), _DEFAULTS["hotkeys"])
+    return ChainMap(config, _DEFAULTS)
+
+
+# Marcador para chaves ausentes no cache de get()
+_MISSING = object()
+
+
+@lru_cache(maxsize=256)
+def _split_key(key: str) -> Tuple[str, ...]:
+    """
+    Converte uma chave pontuada ("pointer_chains.x.base_offset") no caminho
+    de acesso correspondente. O resultado é reutilizado entre chamadas.
+    """
+    return tuple(key.split("."))
+
+
 class ConfigManager:
     """
     Classe centralizada para gerenciamento de configurações.
@@ -38,6 +88,17 @@ class ConfigManager:
         self.config = self._load_config()
         self.logger = logging.getLogger(__name__)
         
+        # Cache de leituras (invalidado em set/update/reload_config)
+        self._get_cache: Dict[str, Any] = {}
+        self._log_level_cached = None
+        self._xyz_addrs_cached = None
+        
+    def _invalidate_cache(self) -> None:
+        """Descarta os valores memorizados após qualquer alteração no config."""
+        self._get_cache.clear()
+        self._log_level_cached = None
+        self._xyz_addrs_cached = None
+        
     def _migrate_config_if_needed(self, config_path: str) -> str:
         """
         Migra automaticamente config.json da raiz para config/ se necessário.
@@ -52,7 +113,10 @@ class ConfigManager:
         new_path = config_path
         
         # Se o arquivo já está no local correto, não fazer nada
+        if new_path in _resolved_config_paths:
+            return new_path
         if os.path.exists(new_path):
+            _resolved_config_paths.add(new_path)
             return new_path
             
         # Se existe config.json na raiz, migrar
@@ -66,6 +130,7 @@ class ConfigManager:
                 # Mover arquivo
                 shutil.move(old_path, new_path)
                 print(f"✅ Configuração migrada: {old_path} → {new_path}")
+                _resolved_config_paths.add(new_path)
                 
                 # Migrar backup se existir
                 old_backup = f"{old_path}.bak"
@@ -82,33 +147,39 @@ class ConfigManager:
                 
         return new_path
         
-    def _load_config(self) -> Dict[str, Any]:
+    def _load_config(self) -> ChainMap:
         """
         Carrega o arquivo de configuração com valores padrão para campos ausentes.
         
         Returns:
-            Dicionário com as configurações carregadas
+            Configurações carregadas, com fallback para os valores padrão
         """
         try:
-            with open(self.config_path, 'r') as f:
-                config = json.load(f)
-            
-            # Mesclar com valores padrão para garantir que todos os campos existam
-            merged_config = DEFAULT_CONFIG.copy()
-            merged_config.update(config)
+            with open(self.config_path, 'rb') as f:
+                data = f.read()
+            config = _json_fast.loads(data) if _json_fast else json.loads(data)
             
-            # Garantir que estruturas aninhadas também tenham valores padrão
-            if "hotkeys" in config:
-                merged_hotkeys = DEFAULT_CONFIG["hotkeys"].copy()
-                merged_hotkeys.update(config["hotkeys"])
-                merged_config["hotkeys"] = merged_hotkeys
-                
-            return merged_config
+            # Campos ausentes são resolvidos nos valores padrão, sem cópias
+            return _with_defaults(config)
             
         except (json.JSONDecodeError, FileNotFoundError) as e:
             logging.warning(f"Erro ao carregar configuração de '{self.config_path}': {e}")
             logging.info("Usando valores padrão para configuração.")
-            return DEFAULT_CONFIG.copy()
+            return _with_defaults({})
+    
+    def _user_overrides(self) -> Dict[str, Any]:
+        """
+        Extrai apenas os valores definidos pelo usuário (sem os padrões),
+        em dicionários simples prontos para serializar.
+        
+        Returns:
+            Dicionário com a camada do usuário
+        """
+        overrides = dict(self.config.maps[0])
+        for key, value in overrides.items():
+            if isinstance(value, ChainMap):
+                overrides[key] = dict(value.maps[0])
+        return overrides
             
     def save_config(self) -> bool:
         """
@@ -120,19 +191,25 @@ class ConfigManager:
         try:
             # Fazer backup da configuração anterior
             try:
-                import os
                 if os.path.exists(self.config_path):
                     backup_path = f"{self.config_path}.bak"
-                    with open(self.config_path, 'r') as source:
-                        with open(backup_path, 'w') as target:
-                            target.write(source.read())
+                    shutil.copyfile(self.config_path, backup_path)
                     self.logger.debug(f"Backup da configuração criado em {backup_path}")
             except Exception as e:
                 self.logger.warning(f"Erro ao criar backup da configuração: {e}")
             
-            # Salvar configuração atual
-            with open(self.config_path, 'w') as f:
-                json.dump(self.config, f, indent=2)
+            # Serializar e gravar em arquivo temporário, substituindo o original
+            # de forma atômica para nunca deixar um config.json pela metade
+            overrides = self._user_overrides()
+            if _json_fast:
+                data = _json_fast.dumps(overrides, option=_json_fast.OPT_INDENT_2)
+            else:
+                data = json.dumps(overrides, indent=2).encode('utf-8')
+            
+            tmp_path = f"{self.config_path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self.config_path)
                 
             self.logger.info(f"Configuração salva com sucesso em {self.config_path}")
             return True
@@ -150,6 +227,7 @@ class ConfigManager:
         """
         try:
             self.config = self._load_config()
+            self._invalidate_cache()
             self.logger.debug("Configuração recarregada com sucesso")
             return True
         except Exception as e:
@@ -167,16 +245,32 @@ class ConfigManager:
         Returns:
             Valor da configuração ou o default
         """
-        if "." in key:  # Acesso a configurações aninhadas
-            parts = key.split(".")
-            current = self.config
-            for part in parts:
-                if isinstance(current, dict) and part in current:
-                    current = current[part]
-                else:
-                    return default
-            return current
-        return self.config.get(key, default)
+        try:
+            value = self._get_cache[key]
+        except KeyError:
+            value = self._get_cache[key] = self._lookup(key)
+        return default if value is _MISSING else value
+    
+    def _lookup(self, key: str) -> Any:
+        """
+        Resolve uma chave (simples ou pontuada) diretamente no dicionário.
+        
+        Returns:
+            Valor encontrado ou _MISSING se a chave não existir
+        """
+        # Chaves simples são a maioria: tentar direto antes de procurar "."
+        value = self.config.get(key, _MISSING)
+        if value is not _MISSING or "." not in key:
+            return value
+        
+        # Acesso a configurações aninhadas
+        current = self.config
+        try:
+            for part in _split_key(key):
+                current = current[part]
+        except (TypeError, KeyError):
+            return _MISSING
+        return current
     
     def set(self, key: str, value: Any) -> None:
         """
@@ -187,7 +281,7 @@ class ConfigManager:
             value: Valor a atribuir
         """
         if "." in key:  # Acesso a configurações aninhadas
-            parts = key.split(".")
+            parts = _split_key(key)
             current = self.config
             for i, part in enumerate(parts[:-1]):
                 if part not in current:
@@ -196,6 +290,7 @@ class ConfigManager:
             current[parts[-1]] = value
         else:
             self.config[key] = value
+        self._invalidate_cache()
     
     def update(self, updates: Dict[str, Any]) -> None:
         """
@@ -214,15 +309,17 @@ class ConfigManager:
         Returns:
             Constante do logging (DEBUG, INFO, etc.)
         """
-        level_str = self.get("log_level", "INFO").upper()
-        levels = {
-            "DEBUG": logging.DEBUG,
-            "INFO": logging.INFO,
-            "WARNING": logging.WARNING,
-            "ERROR": logging.ERROR,
-            "CRITICAL": logging.CRITICAL
-        }
-        return levels.get(level_str, logging.INFO)
+        if self._log_level_cached is None:
+            level_str = self.get("log_level", "INFO").upper()
+            levels = {
+                "DEBUG": logging.DEBUG,
+                "INFO": logging.INFO,
+                "WARNING": logging.WARNING,
+                "ERROR": logging.ERROR,
+                "CRITICAL": logging.CRITICAL
+            }
+            self._log_level_cached = levels.get(level_str, logging.INFO)
+        return self._log_level_cached
     
     def get_pointer_chains(self) -> Dict[str, Dict[str, Union[int, List[int]]]]:
         """
@@ -233,6 +330,24 @@ class ConfigManager:
         """
         return self.get("pointer_chains", {})
     
+    @property
+    def xyz_addrs(self) -> Tuple[int, int, Union[int, None]]:
+        """
+        Endereços base de X, Y e Z já resolvidos, memorizados até a próxima
+        alteração no config.
+        
+        Returns:
+            Tupla (addr_x, addr_y, addr_z); addr_z é None se não configurado
+        """
+        if self._xyz_addrs_cached is None:
+            pointer_chains = self.get_pointer_chains()
+            z_chain = pointer_chains.get('z')
+            self._xyz_addrs_cached = (
+                pointer_chains['x']['base_offset'],
+                pointer_chains['y']['base_offset'],
+                z_chain['base_offset'] if z_chain else None,
+            )
+        return self._xyz_addrs_cached
     
     def get_module_name(self) -> str:
         """
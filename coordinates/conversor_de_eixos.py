@@ -2,17 +2,90 @@ import re
 import sys
 import json
 import ctypes
-import psutil
+import ctypes.wintypes
 import os
 
 # Adicionar diretório principal ao PYTHONPATH
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 # Constantes
-PROCESS_ALL_ACCESS = 0x1F0FFF
+PROCESS_VM_READ = 0x0010
+PROCESS_QUERY_INFORMATION = 0x0400
+TH32CS_SNAPPROCESS = 0x00000002
+INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
 CONFIG_FILE = "config/config.json"
 GAME_PROCESS = "PokeAlliance_dx.exe"
 
+class PROCESSENTRY32W(ctypes.Structure):
+    _fields_ = [
+        ("dwSize", ctypes.wintypes.DWORD),
+        ("cntUsage", ctypes.wintypes.DWORD),
+        ("th32ProcessID", ctypes.wintypes.DWORD),
+        ("th32DefaultHeapID", ctypes.c_size_t),
+        ("th32ModuleID", ctypes.wintypes.DWORD),
+        ("cntThreads", ctypes.wintypes.DWORD),
+        ("th32ParentProcessID", ctypes.wintypes.DWORD),
+        ("pcPriClassBase", ctypes.c_long),
+        ("dwFlags", ctypes.wintypes.DWORD),
+        ("szExeFile", ctypes.c_wchar * 260),
+    ]
+
+# Funções do kernel32 com assinaturas declaradas uma única vez, evitando a
+# conversão genérica de argumentos do ctypes a cada chamada. As DLLs só são
+# carregadas quando necessárias (ver _load_win_api), para que importar este
+# módulo apenas por extract_address/parse_address seja barato.
+_RPM = _OP = _CH = _SNAP = _P32F = _P32N = None
+
+def _load_win_api():
+    """
+    Carrega o kernel32 e declara as assinaturas usadas pelo configurador.
+    """
+    global _RPM, _OP, _CH, _SNAP, _P32F, _P32N
+    if _RPM is not None:
+        return
+    
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    
+    _OP = kernel32.OpenProcess
+    _OP.argtypes = [ctypes.c_uint32, ctypes.c_int, ctypes.c_uint32]
+    _OP.restype = ctypes.c_void_p
+    _CH = kernel32.CloseHandle
+    _CH.argtypes = [ctypes.c_void_p]
+    _CH.restype = ctypes.c_int
+    _SNAP = kernel32.CreateToolhelp32Snapshot
+    _SNAP.argtypes = [ctypes.c_uint32, ctypes.c_uint32]
+    _SNAP.restype = ctypes.c_void_p
+    _P32F = kernel32.Process32FirstW
+    _P32F.argtypes = [ctypes.c_void_p, ctypes.POINTER(PROCESSENTRY32W)]
+    _P32F.restype = ctypes.c_int
+    _P32N = kernel32.Process32NextW
+    _P32N.argtypes = [ctypes.c_void_p, ctypes.POINTER(PROCESSENTRY32W)]
+    _P32N.restype = ctypes.c_int
+    rpm = kernel32.ReadProcessMemory
+    rpm.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t, ctypes.POINTER(ctypes.c_size_t)]
+    rpm.restype = ctypes.c_int
+    _RPM = rpm  # Atribuído por último: marca a API como carregada
+
+# Textos fixos da interface, montados uma única vez
+_SEP = "=" * 54
+_ADDRESS_HELP = f"""                 INSERÇÃO DE ENDEREÇOS
+{_SEP}
+Por favor, cole os endereços diretamente do Cheat Engine
+Formatos aceitos:
+  - P->010B249C (formato exato do Cheat Engine)
+  - 0x010B249C (formato hexadecimal)
+  - 010B249C (hex sem prefixo)
+  - 17507484 (decimal)
+
+Opções de saída:
+  - Digite 'menu' ou deixe em branco para voltar ao menu
+  - Pressione Ctrl+C para cancelar
+"""
+
+# Padrões de endereço pré-compilados
+_CE_ADDR_RE = re.compile(r'P->([0-9A-Fa-f]+)')
+_HEX_STRIP = str.maketrans('', '', '0123456789ABCDEFabcdef')
+
 def extract_address(addr_str):
     """
     Extrai o endereço hexadecimal de strings no formato do Cheat Engine como "P->010B249C".
@@ -21,7 +94,7 @@ def extract_address(addr_str):
     addr_str = addr_str.strip()
     
     # Procurar por padrão P->XXXXXXXX ou semelhante
-    match = re.search(r'P->([0-9A-Fa-f]+)', addr_str)
+    match = _CE_ADDR_RE.search(addr_str)
     if match:
         hex_addr = match.group(1)
         # Adicionar prefixo 0x se não existir
@@ -34,7 +107,7 @@ def extract_address(addr_str):
         return addr_str
     
     # Verificar se é um número hexadecimal sem 0x
-    if all(c in '0123456789ABCDEFabcdef' for c in addr_str):
+    if addr_str.translate(_HEX_STRIP) == '':
         return '0x' + addr_str
     
     # Não conseguiu extrair
@@ -42,7 +115,18 @@ def extract_address(addr_str):
 
 def parse_address(addr_str):
     """
-    Converte uma string de endereço para inteiro, suportando formatos hex e decimal.
+    Interpreta uma string de endereço (hex, decimal ou formato do Cheat
+    Engine), devolvendo o endereço em texto hex e como inteiro.
+    
+    Args:
+        addr_str: Endereço digitado pelo usuário
+    
+    Returns:
+        Tupla (hex_str, valor): o endereço hex extraído da string (ou
+        hex(valor) se ela estava em decimal) e o endereço inteiro
+    
+    Raises:
+        ValueError: Se a string não for um endereço válido
     """
     addr_str = addr_str.strip()
     
@@ -54,23 +138,84 @@ def parse_address(addr_str):
     try:
         # Se começa com 0x, é hexadecimal
         if addr_str.lower().startswith("0x"):
-            return int(addr_str, 16)
+            value = int(addr_str, 16)
         # Se começa com qualquer outra coisa, tenta interpretar como decimal
         else:
-            return int(addr_str)
+            value = int(addr_str)
     except ValueError:
         raise ValueError(f"Formato de endereço inválido: {addr_str}")
+    
+    return (extracted or hex(value)), value
+
+def _read_xyz(handle, x_addr, y_addr, z_addr):
+    """
+    Lê X, Y e Z com uma única chamada ReadProcessMemory quando os três
+    endereços estão dentro do mesmo bloco de 12 bytes (struct de coordenadas).
+    
+    Returns:
+        Tupla (x, y, z) ou None se os endereços não forem contíguos ou a leitura falhar
+    """
+    base = min(x_addr, y_addr, z_addr)
+    offsets = (x_addr - base, y_addr - base, z_addr - base)
+    if any(off % 4 or off > 8 for off in offsets):
+        return None
+    
+    buf = (ctypes.c_int32 * 3)()
+    read = ctypes.c_size_t()
+    if not _RPM(
+        handle, 
+        base, 
+        ctypes.byref(buf), 
+        ctypes.sizeof(buf), 
+        ctypes.byref(read)
+    ):
+        return None
+    
+    return tuple(buf[off // 4] for off in offsets)
+
+def _write_coords_banner(body):
+    """
+    Exibe o quadro de coordenadas atuais com uma única escrita no stdout.
+    """
+    sys.stdout.write(f"\n{_SEP}\n        COORDENADAS ATUAIS:\n{_SEP}\n{body}\n{_SEP}\n")
+
+def _find_game_pid(process_name=GAME_PROCESS):
+    """
+    Procura o PID do jogo em um snapshot Toolhelp da lista de processos:
+    uma única chamada ao kernel traz todos os nomes, sem abrir cada processo.
+    
+    Returns:
+        PID do processo ou None se não estiver rodando
+    """
+    _load_win_api()
+    
+    snapshot = _SNAP(TH32CS_SNAPPROCESS, 0)
+    if not snapshot or snapshot == INVALID_HANDLE_VALUE:
+        return None
+    
+    target = process_name.lower()
+    entry = PROCESSENTRY32W()
+    entry.dwSize = ctypes.sizeof(PROCESSENTRY32W)
+    pentry = ctypes.byref(entry)
+    
+    try:
+        ok = _P32F(snapshot, pentry)
+        while ok:
+            if entry.szExeFile.lower() == target:
+                return entry.th32ProcessID
+            ok = _P32N(snapshot, pentry)
+    finally:
+        _CH(snapshot)
+    
+    return None
 
 def update_poketibia_config():
     print(f"Atualizador de configuração para PokeTibia Bot")
     print(f"Detectando endereços para o processo: {GAME_PROCESS}")
     
     # Encontrar PID do jogo
-    pid = None
-    for proc in psutil.process_iter(['name', 'pid']):
-        if proc.info['name'] == GAME_PROCESS:
-            pid = proc.info['pid']
-            break
+    _load_win_api()
+    pid = _find_game_pid()
 
     if not pid:
         print(f"ERRO: Jogo {GAME_PROCESS} não está rodando!")
@@ -78,9 +223,8 @@ def update_poketibia_config():
 
     print(f"Jogo encontrado! PID: {pid}")
     
-    # Abrir processo
-    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
-    handle = kernel32.OpenProcess(PROCESS_ALL_ACCESS, False, pid)
+    # Abrir processo (somente leitura basta para testar as coordenadas)
+    handle = _OP(PROCESS_VM_READ | PROCESS_QUERY_INFORMATION, False, pid)
     
     if not handle:
         error_code = ctypes.get_last_error()
@@ -103,86 +247,36 @@ def update_poketibia_config():
     if "pointer_chains" in config:
         try:
             # Tentar ler as coordenadas atuais
-            kernel32 = ctypes.windll.kernel32
-            
-            # Ler coordenada X
-            x_value = ctypes.c_int32()
-            x_read = ctypes.c_size_t()
-            x_result = kernel32.ReadProcessMemory(
-                handle, 
-                ctypes.c_void_p(config["pointer_chains"]["x"]["base_offset"]), 
-                ctypes.byref(x_value), 
-                ctypes.sizeof(x_value), 
-                ctypes.byref(x_read)
-            )
-            
-            # Ler coordenada Y
-            y_value = ctypes.c_int32()
-            y_read = ctypes.c_size_t()
-            y_result = kernel32.ReadProcessMemory(
-                handle, 
-                ctypes.c_void_p(config["pointer_chains"]["y"]["base_offset"]), 
-                ctypes.byref(y_value), 
-                ctypes.sizeof(y_value), 
-                ctypes.byref(y_read)
-            )
+            pointer_chains = config["pointer_chains"]
+            addrs = [pointer_chains[axis]["base_offset"] for axis in ("x", "y", "z")]
             
-            # Ler coordenada Z
-            z_value = ctypes.c_int32()
-            z_read = ctypes.c_size_t()
-            z_result = kernel32.ReadProcessMemory(
-                handle, 
-                ctypes.c_void_p(config["pointer_chains"]["z"]["base_offset"]), 
-                ctypes.byref(z_value), 
-                ctypes.sizeof(z_value), 
-                ctypes.byref(z_read)
-            )
+            # Uma única leitura quando X/Y/Z são contíguos; senão, uma por eixo
+            current = _read_xyz(handle, *addrs)
+            if current is None:
+                values = []
+                value = ctypes.c_int32()
+                read = ctypes.c_size_t()
+                pvalue, pread = ctypes.byref(value), ctypes.byref(read)
+                for addr in addrs:
+                    if not _RPM(handle, addr, pvalue, ctypes.sizeof(value), pread):
+                        break
+                    values.append(value.value)
+                else:
+                    current = tuple(values)
             
-            if x_result and y_result and z_result:
-                x_coord = x_value.value
-                y_coord = y_value.value
-                z_coord = z_value.value
+            if current is not None:
+                x_coord, y_coord, z_coord = current
                 
-                print("\n" + "=" * 54)
-                print("        COORDENADAS ATUAIS:")
-                print("=" * 54)
-                print(f"Eixo X: {x_coord}")
-                print(f"Eixo Y: {y_coord}")
-                print(f"Eixo Z: {z_coord}")
-                print("=" * 54)
+                _write_coords_banner(f"Eixo X: {x_coord}\nEixo Y: {y_coord}\nEixo Z: {z_coord}")
             else:
-                print("\n" + "=" * 54)
-                print("        COORDENADAS ATUAIS:")
-                print("=" * 54)
-                print("Falha ao ler coordenadas")
-                print("(Endereços podem estar incorretos)")
-                print("=" * 54)
+                _write_coords_banner("Falha ao ler coordenadas\n(Endereços podem estar incorretos)")
         except Exception as e:
-            print("\n" + "=" * 54)
-            print("        COORDENADAS ATUAIS:")
-            print("=" * 54)
-            print("Erro ao ler coordenadas atuais")
-            print("(Configuração pode estar incompleta)")
-            print("=" * 54)
+            _write_coords_banner("Erro ao ler coordenadas atuais\n(Configuração pode estar incompleta)")
     else:
-        print("\n" + "=" * 54)
-        print("        COORDENADAS ATUAIS:")
-        print("=" * 54)
-        print("Nenhuma configuração de coordenadas encontrada")
-        print("=" * 54)
+        _write_coords_banner("Nenhuma configuração de coordenadas encontrada")
     
     # Solicitar os endereços do Cheat Engine
-    print("                 INSERÇÃO DE ENDEREÇOS")
-    print("=" * 54)
-    print("Por favor, cole os endereços diretamente do Cheat Engine")
-    print("Formatos aceitos:")
-    print("  - P->010B249C (formato exato do Cheat Engine)")
-    print("  - 0x010B249C (formato hexadecimal)")
-    print("  - 010B249C (hex sem prefixo)")
-    print("  - 17507484 (decimal)")
-    print("\nOpções de saída:")
-    print("  - Digite 'menu' ou deixe em branco para voltar ao menu")
-    print("  - Pressione Ctrl+C para cancelar")
+    sys.stdout.write(_ADDRESS_HELP)
     
     try:
         try:
@@ -192,39 +286,36 @@ def update_poketibia_config():
             # Verificar se quer voltar ao menu
             if not x_addr_str or x_addr_str.lower() == 'menu':
                 print("Retornando ao menu principal...")
-                kernel32.CloseHandle(handle)
+                _CH(handle)
                 return True
-            x_hex = extract_address(x_addr_str)
-            x_addr = parse_address(x_addr_str)
+            x_hex, x_addr = parse_address(x_addr_str)
             
             y_addr_str = input("Endereço para coordenada Y (ou 'menu' para voltar): ").strip()
             
             # Verificar se quer voltar ao menu
             if not y_addr_str or y_addr_str.lower() == 'menu':
                 print("Retornando ao menu principal...")
-                kernel32.CloseHandle(handle)
+                _CH(handle)
                 return True
                 
-            y_hex = extract_address(y_addr_str)
-            y_addr = parse_address(y_addr_str)
+            y_hex, y_addr = parse_address(y_addr_str)
             
             z_addr_str = input("Endereço para coordenada Z (ou 'menu' para voltar): ").strip()
             
             # Verificar se quer voltar ao menu
             if not z_addr_str or z_addr_str.lower() == 'menu':
                 print("Retornando ao menu principal...")
-                kernel32.CloseHandle(handle)
+                _CH(handle)
                 return True
-            z_hex = extract_address(z_addr_str)
-            z_addr = parse_address(z_addr_str)
+            z_hex, z_addr = parse_address(z_addr_str)
         except (KeyboardInterrupt, EOFError):
             print("\nOperação cancelada pelo usuário.")
-            kernel32.CloseHandle(handle)
+            _CH(handle)
             return False
         
     except ValueError as e:
         print(f"ERRO: {e}")
-        kernel32.CloseHandle(handle)
+        _CH(handle)
         return False
     
     print(f"\nEndereços extraídos e convertidos:")
@@ -237,37 +328,42 @@ def update_poketibia_config():
     
     success = True
     coords = {}
+    axes = [("X", x_addr, x_hex), ("Y", y_addr, y_hex), ("Z", z_addr, z_hex)]
     
-    for name, addr, hex_str in [("X", x_addr, x_hex), ("Y", y_addr, y_hex), ("Z", z_addr, z_hex)]:
+    # Tentar ler as três coordenadas de uma vez (endereços contíguos)
+    batch = _read_xyz(handle, x_addr, y_addr, z_addr)
+    if batch is not None:
+        for (name, addr, hex_str), value in zip(axes, batch):
+            print(f"Coordenada {name} ({hex_str}): {value}")
+            coords[name.lower()] = value
+    else:
+        # Buffers reaproveitados entre os eixos
         value = ctypes.c_int32()
         read = ctypes.c_size_t()
+        pvalue, pread = ctypes.byref(value), ctypes.byref(read)
+        size = ctypes.sizeof(value)
         
-        result = kernel32.ReadProcessMemory(
-            handle, 
-            ctypes.c_void_p(addr), 
-            ctypes.byref(value), 
-            ctypes.sizeof(value), 
-            ctypes.byref(read)
-        )
-        
-        if result:
-            print(f"Coordenada {name} ({hex_str}): {value.value}")
-            coords[name.lower()] = value.value
-        else:
-            error_code = ctypes.get_last_error()
-            print(f"ERRO ao ler coordenada {name}: Erro {error_code}")
-            success = False
+        for name, addr, hex_str in axes:
+            result = _RPM(handle, addr, pvalue, size, pread)
+
+            if result:
+                print(f"Coordenada {name} ({hex_str}): {value.value}")
+                coords[name.lower()] = value.value
+            else:
+                error_code = ctypes.get_last_error()
+                print(f"ERRO ao ler coordenada {name}: Erro {error_code}")
+                success = False
     
     if not success:
         print("\nATENÇÃO: Alguns endereços não puderam ser lidos!")
         try:
             proceed = input("Deseja continuar mesmo assim? (S/N): ").strip().upper()
             if proceed != 'S':
-                kernel32.CloseHandle(handle)
+                _CH(handle)
                 return False
         except (KeyboardInterrupt, EOFError):
             print("\nOperação cancelada pelo usuário.")
-            kernel32.CloseHandle(handle)
+            _CH(handle)
             return False
     
     # Atualizar configuração
@@ -303,11 +399,11 @@ def update_poketibia_config():
             print(f"\nConfiguração atualizada com sucesso em {CONFIG_FILE}!")
     except Exception as e:
         print(f"ERRO ao salvar configuração: {e}")
-        kernel32.CloseHandle(handle)
+        _CH(handle)
         return False
     
     # Fechar handle
-    kernel32.CloseHandle(handle)
+    _CH(handle)
     
     print("\n===== INSTRUÇÕES =====")
     print("1. A configuração foi atualizada para usar os endereços diretos")
@@ -3,12 +3,14 @@ PokeTibia Bot - Memory Management Module
 Enhanced memory access system with better error handling, caching, 
 and robustness for the PokeTibia Bot.
 """
+import bisect
 import ctypes
-import psutil
+import struct
 import time
 import logging
 import threading
-from typing import Dict, List, Tuple, Any, Union, Optional, Type
+from collections import OrderedDict
+from typing import Dict, List, Tuple, Any, Union, Optional, Type, Callable
 from ctypes import wintypes
 
 # Core memory access functionality
@@ -16,6 +18,295 @@ from ctypes import wintypes
 
 # Constants for memory access
 PROCESS_ALL_ACCESS = 0x1F0FFF
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+TH32CS_SNAPPROCESS = 0x00000002
+INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+STILL_ACTIVE = 259
+
+# ReadProcessMemory errors that suggest the process went away or our handle
+# is no longer usable: wake the reconnection monitor when they show up
+ERROR_ACCESS_DENIED = 5
+ERROR_INVALID_HANDLE = 6
+ERROR_PARTIAL_COPY = 299
+_DISCONNECT_ERRORS = frozenset((ERROR_ACCESS_DENIED, ERROR_INVALID_HANDLE, ERROR_PARTIAL_COPY))
+PAGE_SIZE = 0x1000
+LIST_MODULES_DEFAULT = 0x00
+
+_monotonic = time.monotonic
+
+
+class PROCESSENTRY32W(ctypes.Structure):
+    """Process entry returned by Process32FirstW/Process32NextW."""
+    _fields_ = [
+        ("dwSize", wintypes.DWORD),
+        ("cntUsage", wintypes.DWORD),
+        ("th32ProcessID", wintypes.DWORD),
+        ("th32DefaultHeapID", ctypes.c_size_t),
+        ("th32ModuleID", wintypes.DWORD),
+        ("cntThreads", wintypes.DWORD),
+        ("th32ParentProcessID", wintypes.DWORD),
+        ("pcPriClassBase", ctypes.c_long),
+        ("dwFlags", wintypes.DWORD),
+        ("szExeFile", ctypes.c_wchar * 260),
+    ]
+
+
+class _MODULEINFO(ctypes.Structure):
+    """Module information returned by GetModuleInformation."""
+    _fields_ = [
+        ("lpBaseOfDll", wintypes.LPVOID),
+        ("SizeOfImage", wintypes.DWORD),
+        ("EntryPoint", wintypes.LPVOID),
+    ]
+
+
+_HMODULE_SIZE = ctypes.sizeof(wintypes.HMODULE)
+_PAGE_BUF = ctypes.c_ubyte * PAGE_SIZE
+
+
+# Small integer id per ctypes data type, used in read cache keys
+_TYPE_CODE: Dict[Type, int] = {}
+
+
+def _type_code(data_type: Type) -> int:
+    """Return a stable small int for data_type, assigning one on first use."""
+    code = _TYPE_CODE.get(data_type)
+    if code is None:
+        code = _TYPE_CODE.setdefault(data_type, len(_TYPE_CODE))
+    return code
+
+
+# Cached ctypes.sizeof per data type
+_SIZEOF: Dict[Type, int] = {}
+
+
+def _sizeof(data_type: Type) -> int:
+    """Return ctypes.sizeof(data_type), computed once per type."""
+    size = _SIZEOF.get(data_type)
+    if size is None:
+        size = _SIZEOF[data_type] = ctypes.sizeof(data_type)
+    return size
+
+
+# Plain numeric types are read into a shared per-thread scratch buffer and
+# decoded with struct instead of going through a ctypes instance
+_FAST_UNPACK = {
+    ctypes.c_int32: struct.Struct('<i').unpack_from,
+    ctypes.c_uint32: struct.Struct('<I').unpack_from,
+    ctypes.c_int64: struct.Struct('<q').unpack_from,
+    ctypes.c_uint64: struct.Struct('<Q').unpack_from,
+    ctypes.c_float: struct.Struct('<f').unpack_from,
+    ctypes.c_double: struct.Struct('<d').unpack_from,
+}
+_SCRATCH = ctypes.c_ubyte * 8
+
+
+def _new_read_buffer(pool: Dict[Type, Tuple[Any, Any, int, Any]], data_type: Type) -> Tuple[Any, Any, int, Any]:
+    """
+    Create a pooled read buffer entry as (buffer, byref(buffer), size, unpack).
+    
+    unpack is None for types that must be decoded through buffer.value.
+    """
+    unpack = _FAST_UNPACK.get(data_type)
+    if unpack is not None:
+        scratch = pool.get(_SCRATCH)
+        if scratch is None:
+            scratch = pool[_SCRATCH] = _new_read_buffer(pool, _SCRATCH)
+        return scratch[0], scratch[1], _sizeof(data_type), unpack
+    
+    buffer = data_type()
+    return buffer, ctypes.byref(buffer), _sizeof(data_type), None
+
+
+def _bind(func, argtypes: list, restype: Any):
+    """
+    Declare a foreign function's prototype so ctypes skips generic
+    argument conversion on every call.
+    """
+    func.argtypes = argtypes
+    func.restype = restype
+    return func
+
+
+def _page_spans(items: List[Tuple[int, Type]]) -> List[list]:
+    """
+    Group (address, data_type) items, in address order, into spans that stay
+    on a single memory page.
+    
+    Returns:
+        List of [start, end, indices] spans (indices refer to items)
+    """
+    page_mask = ~(PAGE_SIZE - 1)
+    spans: List[list] = []
+    for i in sorted(range(len(items)), key=lambda k: items[k][0]):
+        address, data_type = items[i]
+        end = address + _sizeof(data_type)
+        
+        if spans:
+            span = spans[-1]
+            if (end - 1) & page_mask == span[0] & page_mask:
+                if end > span[1]:
+                    span[1] = end
+                span[2].append(i)
+                continue
+        spans.append([address, end, [i]])
+    return spans
+
+
+def _decode_span(buffer: Any, start: int, items: List[Tuple[int, Type]], 
+                 indices: List[int], results: List[Any]) -> None:
+    """
+    Decode the values of one span read into buffer (which holds the bytes
+    starting at address start) into results.
+    """
+    for i in indices:
+        address, data_type = items[i]
+        unpack = _FAST_UNPACK.get(data_type)
+        if unpack is not None:
+            results[i] = unpack(buffer, address - start)[0]
+        else:
+            results[i] = data_type.from_buffer_copy(buffer, address - start).value
+
+
+def _page_buffer(pool: Dict[Type, Tuple[Any, Any, int, Any]]) -> Tuple[Any, Any]:
+    """
+    Get the pooled page-sized buffer used for span reads.
+    
+    Returns:
+        Tuple of (buffer, byref to the buffer)
+    """
+    entry = pool.get(_PAGE_BUF)
+    if entry is None:
+        entry = pool[_PAGE_BUF] = _new_read_buffer(pool, _PAGE_BUF)
+    return entry[0], entry[1]
+
+
+_win_api_cache: Optional[Dict[str, Any]] = None
+_win_api_lock = threading.Lock()
+
+
+def _win_api() -> Dict[str, Any]:
+    """
+    Load kernel32/psapi and declare the prototypes used by the memory
+    managers, once per process. Every manager instance shares the result.
+    
+    Returns:
+        Mapping of attribute name -> DLL or bound foreign function
+    """
+    global _win_api_cache
+    if _win_api_cache is not None:
+        return _win_api_cache
+    
+    with _win_api_lock:
+        if _win_api_cache is None:
+            kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+            psapi = ctypes.WinDLL("Psapi.dll", use_last_error=True)
+            
+            _win_api_cache = {
+                "kernel32": kernel32,
+                "psapi": psapi,
+                "_ReadProcessMemory": _bind(
+                    kernel32.ReadProcessMemory,
+                    [wintypes.HANDLE, wintypes.LPCVOID, wintypes.LPVOID, ctypes.c_size_t, ctypes.POINTER(ctypes.c_size_t)],
+                    wintypes.BOOL,
+                ),
+                "_OpenProcess": _bind(
+                    kernel32.OpenProcess, [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD], wintypes.HANDLE
+                ),
+                "_CloseHandle": _bind(kernel32.CloseHandle, [wintypes.HANDLE], wintypes.BOOL),
+                "_CreateToolhelp32Snapshot": _bind(
+                    kernel32.CreateToolhelp32Snapshot, [wintypes.DWORD, wintypes.DWORD], wintypes.HANDLE
+                ),
+                "_Process32FirstW": _bind(
+                    kernel32.Process32FirstW, [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)], wintypes.BOOL
+                ),
+                "_Process32NextW": _bind(
+                    kernel32.Process32NextW, [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)], wintypes.BOOL
+                ),
+                "_GetExitCodeProcess": _bind(
+                    kernel32.GetExitCodeProcess, [wintypes.HANDLE, ctypes.POINTER(wintypes.DWORD)], wintypes.BOOL
+                ),
+                "_IsWow64Process": _bind(
+                    kernel32.IsWow64Process, [wintypes.HANDLE, ctypes.POINTER(wintypes.BOOL)], wintypes.BOOL
+                ),
+                "_EnumProcessModulesEx": _bind(
+                    psapi.EnumProcessModulesEx,
+                    [wintypes.HANDLE, wintypes.LPVOID, wintypes.DWORD, ctypes.POINTER(wintypes.DWORD), wintypes.DWORD],
+                    wintypes.BOOL,
+                ),
+                "_GetModuleBaseNameW": _bind(
+                    psapi.GetModuleBaseNameW,
+                    [wintypes.HANDLE, wintypes.HMODULE, wintypes.LPWSTR, wintypes.DWORD],
+                    wintypes.DWORD,
+                ),
+                "_GetModuleInformation": _bind(
+                    psapi.GetModuleInformation,
+                    [wintypes.HANDLE, wintypes.HMODULE, wintypes.LPVOID, wintypes.DWORD],
+                    wintypes.BOOL,
+                ),
+            }
+    
+    return _win_api_cache
+
+
+def _find_pid_by_name(owner: Any, module_name: str) -> Optional[int]:
+    """
+    Find a process ID by executable name using a Toolhelp snapshot.
+    
+    Args:
+        owner: Memory manager with bound kernel32 functions
+        module_name: Name of the process executable
+        
+    Returns:
+        Process ID or None if not found
+    """
+    snapshot = owner._CreateToolhelp32Snapshot(TH32CS_SNAPPROCESS, 0)
+    if not snapshot or snapshot == INVALID_HANDLE_VALUE:
+        return None
+    
+    target = module_name.lower()
+    entry = PROCESSENTRY32W()
+    entry.dwSize = ctypes.sizeof(PROCESSENTRY32W)
+    pentry = ctypes.byref(entry)
+    
+    try:
+        ok = owner._Process32FirstW(snapshot, pentry)
+        while ok:
+            if entry.szExeFile.lower() == target:
+                return entry.th32ProcessID
+            ok = owner._Process32NextW(snapshot, pentry)
+    finally:
+        owner._CloseHandle(snapshot)
+    
+    return None
+
+
+def _is_pid_alive(owner: Any, pid: int, handle: Optional[int]) -> bool:
+    """
+    Check whether a process is still running via GetExitCodeProcess.
+    
+    Args:
+        owner: Memory manager with bound kernel32 functions
+        pid: Process ID
+        handle: Already open handle to the process, if any (reused when given)
+        
+    Returns:
+        True if the process has not exited
+    """
+    own_handle = None
+    if not handle:
+        handle = own_handle = owner._OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return False
+    
+    try:
+        exit_code = wintypes.DWORD()
+        if not owner._GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+            return False
+        return exit_code.value == STILL_ACTIVE
+    finally:
+        if own_handle:
+            owner._CloseHandle(own_handle)
 
 
 class ProcessError(Exception):
@@ -29,8 +320,22 @@ class ProcessNotFoundError(ProcessError):
 
 
 class MemoryAccessError(ProcessError):
-    """Exception raised when memory access fails."""
-    pass
+    """
+    Exception raised when memory access fails.
+    
+    When a Windows error code is given, its system message is only looked up
+    when the exception is displayed, so failed reads that are retried and
+    then succeed never pay for formatting it.
+    """
+    def __init__(self, message: str, error_code: Optional[int] = None):
+        super().__init__(message)
+        self.error_code = error_code
+    
+    def __str__(self) -> str:
+        message = super().__str__()
+        if self.error_code is None:
+            return message
+        return f"{message} (Error {self.error_code}): {ctypes.WinError(self.error_code)}"
 
 
 class MemoryManager:
@@ -53,10 +358,16 @@ class MemoryManager:
         self.logger = logging.getLogger(__name__)
         
         # Memory cache
-        self.memory_cache = {}
-        self.cache_timestamp = {}
+        # LRU of cache_key -> (value, expires_at)
+        self.memory_cache: "OrderedDict[tuple, Tuple[Any, float]]" = OrderedDict()
         self.cache_duration = 0.1  # 100ms cache duration
-        self.cache_timeout = 10.0   # 10s maximum cache lifetime
+        self.cache_max_entries = 4096
+        self._cache_gen = 0  # Part of every cache key; bumped to invalidate
+        
+        # Recently failed reads: cache_key -> retry_after, so polling a bad
+        # address does not repeat the whole retry/sleep cycle every time
+        self._neg_cache: "OrderedDict[tuple, float]" = OrderedDict()
+        self.neg_cache_duration = 0.2
         
         # Connection state
         self.connected = False
@@ -68,13 +379,25 @@ class MemoryManager:
         self.ptr_type = None
         self.last_connect_attempt = 0
         self.reconnect_interval = 5.0  # 5 seconds between reconnection attempts
+        self._hmod_capacity = 128  # Module handle slots for EnumProcessModules
+        
+        # Short-lived is_process_running result: (checked_at, alive)
+        self._alive_cache: Optional[Tuple[float, bool]] = None
+        self._alive_ttl = 0.5
         
-        # Blocked regions to avoid reading from
-        self.blocked_regions = []
+        # Blocked regions to avoid reading from: sorted, non-overlapping
+        # inclusive ranges kept as parallel start/end lists for bisect
+        self._blocked_starts: List[int] = []
+        self._blocked_ends: List[int] = []
+        
+        # Per-thread reusable read buffers (see _read_buffers)
+        self._tls = threading.local()
         
         # Reconnection monitoring
         self.monitor_thread = None
-        self.stop_monitoring = False
+        self._stop_event = threading.Event()
+        self._reconnect_event = threading.Event()  # Set by failed reads
+        self.monitor_idle_timeout = 30.0  # Safety-net check while healthy
         
         # Initialize DLLs
         self._init_dlls()
@@ -85,8 +408,8 @@ class MemoryManager:
     def _init_dlls(self) -> None:
         """Initialize Windows DLLs for memory access."""
         try:
-            self.kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
-            self.psapi = ctypes.WinDLL("Psapi.dll", use_last_error=True)
+            # Shared, already-prototyped DLL bindings
+            self.__dict__.update(_win_api())
         except Exception as e:
             self.logger.error(f"Failed to load required DLLs: {e}")
             raise RuntimeError(f"Failed to load required DLLs: {e}")
@@ -104,7 +427,7 @@ class MemoryManager:
             
             # Start reconnection monitoring if enabled
             if self.auto_reconnect and not self.monitor_thread:
-                self.stop_monitoring = False
+                self._stop_event.clear()
                 self.monitor_thread = threading.Thread(target=self._reconnection_monitor, daemon=True)
                 self.monitor_thread.start()
                 self.logger.debug("Reconnection monitoring started")
@@ -118,7 +441,8 @@ class MemoryManager:
         """Clean up resources used by the memory manager."""
         # Stop reconnection monitoring
         if self.monitor_thread:
-            self.stop_monitoring = True
+            self._stop_event.set()
+            self._reconnect_event.set()
             self.monitor_thread.join(timeout=1.0)
             self.monitor_thread = None
         
@@ -127,7 +451,7 @@ class MemoryManager:
         
         # Clear cache
         self.memory_cache.clear()
-        self.cache_timestamp.clear()
+        self._neg_cache.clear()
     
     def read_memory(self, address: int, data_type: Type = ctypes.c_int32, 
                    retries: int = 3, delay: float = 0.01, 
@@ -148,84 +472,165 @@ class MemoryManager:
         Raises:
             MemoryAccessError: If reading fails after all retries
         """
+        # Fast path: fresh cache hit while connected. Only addresses that
+        # already passed the checks below can be in the cache.
+        cache_key = (self._cache_gen, address, _type_code(data_type))
+        caching = use_cache and self.cache_enabled
+        if caching and self.connected:
+            cache = self.memory_cache
+            entry = cache.get(cache_key)
+            if entry is not None:
+                value, expires_at = entry
+                if _monotonic() < expires_at:
+                    cache.move_to_end(cache_key)
+                    return value
+        
         # Check if connected
-        if not self.connected:
-            if self.auto_reconnect:
-                self._try_reconnect()
-                if not self.connected:
-                    raise MemoryAccessError(f"Not connected to process {self.module_name}")
-            else:
-                raise MemoryAccessError(f"Not connected to process {self.module_name}")
+        self._ensure_connected()
         
         # Check if address is in a blocked region
-        for start, end in self.blocked_regions:
-            if start <= address <= end:
-                raise MemoryAccessError(f"Address {hex(address)} is in a blocked region")
+        if self._blocked_starts:
+            self._check_blocked(address)
         
-        # Check cache if enabled
-        cache_key = (address, str(data_type))
-        if self.cache_enabled and use_cache:
-            current_time = time.time()
-            if (cache_key in self.memory_cache and 
-                current_time - self.cache_timestamp.get(cache_key, 0) < self.cache_duration):
-                return self.memory_cache[cache_key]
-            
-            # Clear old cache entries
-            self._clear_old_cache_entries(current_time)
+        # Fail fast on addresses that failed moments ago
+        if caching:
+            retry_after = self._neg_cache.get(cache_key)
+            if retry_after is not None and _monotonic() < retry_after:
+                raise MemoryAccessError(f"Read at {hex(address)} failed recently (cached failure)")
         
         # Verify address is reasonable
         if not (0 <= address < (2**64)):
             raise ValueError(f"Invalid address: {hex(address)}")
         
+        # Reuse this thread's buffer for the type
+        pool, read, pread = self._read_buffers()
+        entry = pool.get(data_type)
+        if entry is None:
+            entry = pool[data_type] = _new_read_buffer(pool, data_type)
+        buffer, pbuffer, size, unpack = entry
+        
         # Attempt to read with retries
         last_error = None
         for i in range(retries):
+            error_code = None
             try:
-                # Create buffer for the data
-                buffer = data_type()
-                read = ctypes.c_size_t()
-                
                 # Read the memory
-                if not self.kernel32.ReadProcessMemory(
+                if not self._ReadProcessMemory(
                     self.handle, 
-                    ctypes.c_void_p(address), 
-                    ctypes.byref(buffer), 
-                    ctypes.sizeof(buffer), 
-                    ctypes.byref(read)
+                    address, 
+                    pbuffer, 
+                    size, 
+                    pread
                 ):
                     error_code = ctypes.get_last_error()
-                    raise MemoryAccessError(f"Read failed (Error {error_code}): {ctypes.WinError(error_code)}")
+                    if error_code in _DISCONNECT_ERRORS:
+                        self._reconnect_event.set()
+                    raise MemoryAccessError("Read failed", error_code)
                 
                 # Verify we read the right amount of data
-                if read.value != ctypes.sizeof(buffer):
-                    raise MemoryAccessError(f"Partial read: {read.value}/{ctypes.sizeof(buffer)} bytes at {hex(address)}")
+                if read.value != size:
+                    raise MemoryAccessError(f"Partial read: {read.value}/{size} bytes at {hex(address)}")
+                
+                value = unpack(buffer)[0] if unpack is not None else buffer.value
                 
                 # Cache the result if enabled
-                if self.cache_enabled and use_cache:
-                    self.memory_cache[cache_key] = buffer.value
-                    self.cache_timestamp[cache_key] = time.time()
+                if caching:
+                    cache = self.memory_cache
+                    cache[cache_key] = (value, _monotonic() + self.cache_duration)
+                    cache.move_to_end(cache_key)
+                    if len(cache) > self.cache_max_entries:
+                        cache.popitem(last=False)  # Evict least recently used
                 
-                return buffer.value
+                return value
             
             except Exception as e:
                 last_error = e
                 if i < retries - 1:  # Not the last retry
-                    self.logger.debug(f"Read attempt {i+1}/{retries} failed for {hex(address)}: {e}")
+                    self.logger.debug("Read attempt %d/%d failed for %s: %s", i + 1, retries, hex(address), e)
                     time.sleep(delay)
                     
                     # Check if we need to reconnect
-                    if isinstance(e, MemoryAccessError) and "Handle is invalid" in str(e):
+                    if error_code == ERROR_INVALID_HANDLE:
                         self._try_reconnect()
                         if not self.connected:
                             break  # No point retrying if reconnection failed
         
         # If we get here, all attempts failed
         self.logger.error(f"Failed to read {hex(address)} after {retries} attempts")
+        if caching:
+            neg = self._neg_cache
+            neg[cache_key] = _monotonic() + self.neg_cache_duration
+            neg.move_to_end(cache_key)
+            if len(neg) > self.cache_max_entries:
+                neg.popitem(last=False)
         if last_error:
             raise last_error
         else:
             raise MemoryAccessError(f"Failed to read memory at {hex(address)}")
     
+    def read_batch(self, items: List[Tuple[int, Type]]) -> List[Any]:
+        """
+        Read several small values (scatter read), issuing one ReadProcessMemory
+        per group of values that share a memory page.
+        
+        Each group reads only the span between its first and last byte, not
+        the whole page. Values alone in their group, or that straddle a page
+        boundary, go through read_memory as usual, and so do the values of a
+        span whose read fails (keeping its retries and reconnect).
+        
+        Args:
+            items: List of (address, data_type) pairs
+            
+        Returns:
+            Values read, in the same order as items
+            
+        Raises:
+            MemoryAccessError: If a value cannot be read even by read_memory
+        """
+        self._ensure_connected()
+        
+        if self._blocked_starts:
+            for address, _ in items:
+                self._check_blocked(address)
+        
+        results: List[Any] = [None] * len(items)
+        
+        # Group items, in address order, into spans that stay on one page
+        spans = _page_spans(items)
+        
+        pool, read, pread = self._read_buffers()
+        page_buf, ppage_buf = _page_buffer(pool)
+        
+        for start, end, indices in spans:
+            if len(indices) == 1:
+                address, data_type = items[indices[0]]
+                results[indices[0]] = self.read_memory(address, data_type)
+                continue
+            
+            # One syscall for every value in this span
+            size = end - start
+            if self._ReadProcessMemory(
+                self.handle, 
+                start, 
+                ppage_buf, 
+                size, 
+                pread
+            ) and read.value == size:
+                _decode_span(page_buf, start, items, indices, results)
+                continue
+            
+            error_code = ctypes.get_last_error()
+            if error_code in _DISCONNECT_ERRORS:
+                self._reconnect_event.set()
+            self.logger.debug(f"Span read failed at {hex(start)} (Error {error_code}); reading values one by one")
+            
+            # Slow path for this span: retries, reconnect and cache per value
+            for index in indices:
+                address, data_type = items[index]
+                results[index] = self.read_memory(address, data_type)
+        
+        return results
+    
     def resolve_pointer_chain(self, base_address: int, offsets: List[int]) -> int:
         """
         Resolve a pointer chain starting from the base address.
@@ -240,21 +645,60 @@ class MemoryManager:
         Raises:
             MemoryAccessError: If resolving fails
         """
+        self._ensure_connected()
+        
         # Start with the base address
         addr = self.base_addr + base_address if self.base_addr is not None else base_address
         self.logger.debug(f"Resolving pointer chain starting at {hex(addr)}")
         
-        # Follow each offset in the chain
+        return self._resolve_fast(addr, offsets)
+    
+    def _resolve_fast(self, addr: int, offsets: List[int]) -> int:
+        """
+        Follow a pointer chain with direct ReadProcessMemory calls.
+        
+        Pointers are volatile, so hops bypass the read cache of read_memory
+        and read straight into the pooled pointer buffer. A hop that fails
+        is retried through read_memory, which keeps its retries and the
+        reconnect on an invalid handle.
+        
+        Args:
+            addr: Absolute address of the first pointer
+            offsets: List of offsets to follow
+            
+        Returns:
+            Final resolved address
+            
+        Raises:
+            MemoryAccessError: If a hop cannot be read
+            ValueError: If a hop lands outside the user address space
+        """
+        rpm = self._ReadProcessMemory
+        handle = self.handle
+        check_blocked = self._check_blocked if self._blocked_starts else None
+        
+        pool, read, pread = self._read_buffers()
+        entry = pool.get(self.ptr_type)
+        if entry is None:
+            entry = pool[self.ptr_type] = _new_read_buffer(pool, self.ptr_type)
+        buffer, pbuffer, size, unpack = entry
+        
         for i, offset in enumerate(offsets):
-            # Read the pointer value
-            try:
-                ptr = self.read_memory(addr, self.ptr_type)
-            except MemoryAccessError as e:
-                raise MemoryAccessError(f"Failed to resolve pointer at step {i+1}: {e}")
+            if check_blocked is not None:
+                check_blocked(addr)
+            
+            if rpm(handle, addr, pbuffer, size, pread) and read.value == size:
+                ptr = unpack(buffer)[0]
+            else:
+                # Slow path for this hop: retries, reconnect and cache
+                try:
+                    ptr = self.read_memory(addr, self.ptr_type)
+                except MemoryAccessError as e:
+                    raise MemoryAccessError(f"Failed to resolve pointer at step {i+1}: {e}")
+                handle = self.handle  # May have changed on reconnect
             
             # Apply the offset
             addr = ptr + offset
-            self.logger.debug(f"  Step {i+1}: {hex(ptr)} + {hex(offset)} = {hex(addr)}")
             
             # Verify address is reasonable
             if not (0 <= addr < (2**48)):  # 48-bit is typical virtual address space
@@ -272,19 +716,94 @@ class MemoryManager:
         if self.pid is None:
             return False
         
-        try:
-            # Check if process still exists
-            process = psutil.Process(self.pid)
-            return process.is_running() and process.name().lower() == self.module_name.lower()
-        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-            return False
+        now = time.monotonic()
+        cached = self._alive_cache
+        if cached is not None and now - cached[0] < self._alive_ttl:
+            return cached[1]
+        
+        # An open handle keeps the PID from being reused, so the exit code
+        # alone tells whether our process is still alive
+        alive = _is_pid_alive(self, self.pid, self.handle)
+        self._alive_cache = (now, alive)
+        return alive
     
     def clear_cache(self) -> None:
         """Clear the memory read cache."""
         self.memory_cache.clear()
-        self.cache_timestamp.clear()
+        self._neg_cache.clear()
         self.logger.debug("Memory cache cleared")
     
+    def _read_buffers(self) -> Tuple[Dict[Type, Tuple[Any, Any, int, Any]], ctypes.c_size_t, Any]:
+        """
+        Get the calling thread's buffer pool (one entry per data type, see
+        _new_read_buffer) and bytes-read counter, creating them on first use.
+        
+        Returns:
+            Tuple of (buffer pool, bytes-read counter, byref to the counter)
+        """
+        tls = self._tls
+        try:
+            return tls.pool, tls.read, tls.pread
+        except AttributeError:
+            tls.pool, tls.read = {}, ctypes.c_size_t()
+            tls.pread = ctypes.byref(tls.read)
+            return tls.pool, tls.read, tls.pread
+    
+    def _ensure_connected(self) -> None:
+        """
+        Make sure there is a live connection, reconnecting if allowed.
+        
+        Raises:
+            MemoryAccessError: If not connected to the process
+        """
+        if not self.connected:
+            if self.auto_reconnect:
+                self._try_reconnect()
+                if not self.connected:
+                    raise MemoryAccessError(f"Not connected to process {self.module_name}")
+            else:
+                raise MemoryAccessError(f"Not connected to process {self.module_name}")
+    
+    def _check_blocked(self, address: int) -> None:
+        """
+        Refuse addresses that fall inside a blocked region.
+        
+        Raises:
+            MemoryAccessError: If the address is blocked
+        """
+        i = bisect.bisect_right(self._blocked_starts, address) - 1
+        if i >= 0 and address <= self._blocked_ends[i]:
+            raise MemoryAccessError(f"Address {hex(address)} is in a blocked region")
+    
+    @property
+    def blocked_regions(self) -> List[Tuple[int, int]]:
+        """Blocked regions as a list of inclusive (start, end) ranges."""
+        return list(zip(self._blocked_starts, self._blocked_ends))
+    
+    def add_blocked_region(self, start: int, end: int) -> None:
+        """
+        Block reads from an inclusive address range, merging it with any
+        overlapping or adjacent regions so lookups stay a single bisect.
+        
+        Args:
+            start: First blocked address
+            end: Last blocked address
+        """
+        starts, ends = self._blocked_starts, self._blocked_ends
+        
+        # Regions that overlap or touch [start, end]
+        lo = bisect.bisect_left(ends, start - 1)
+        hi = bisect.bisect_right(starts, end + 1)
+        if lo < hi:
+            start = min(start, starts[lo])
+            end = max(end, ends[hi - 1])
+        
+        starts[lo:hi] = [start]
+        ends[lo:hi] = [end]
+        
+        # Cached values may come from the newly blocked range
+        self.memory_cache.clear()
+    
     def _connect(self) -> None:
         """
         Connect to the process and initialize memory access.
@@ -293,9 +812,11 @@ class MemoryManager:
             ProcessNotFoundError: If process is not found
             MemoryAccessError: If connection fails
         """
+        previous = (self.pid, self.base_addr)
         try:
             # Record attempt time
-            self.last_connect_attempt = time.time()
+            self.last_connect_attempt = time.monotonic()
+            self._alive_cache = None
             
             # Find process
             self.pid = self._find_process_pid()
@@ -319,8 +840,11 @@ class MemoryManager:
             else:
                 self.logger.warning(f"Connected to {self.module_name} (PID: {self.pid}) but couldn't get module info")
             
-            # Clear cache on new connection
-            self.clear_cache()
+            # Cached reads stay valid across a reconnect to the same process
+            # image; a new process or relocated module starts a new cache
+            # generation, leaving old entries to age out of the LRU
+            if (self.pid, self.base_addr) != previous:
+                self._cache_gen += 1
             
             self.connected = True
         
@@ -340,14 +864,7 @@ class MemoryManager:
         Returns:
             Process ID or None if not found
         """
-        for proc in psutil.process_iter(['name', 'pid']):
-            try:
-                if proc.info['name'] and proc.info['name'].lower() == self.module_name.lower():
-                    return proc.info['pid']
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                continue
-        
-        return None
+        return _find_pid_by_name(self, self.module_name)
     
     def _open_process(self, pid: int) -> int:
         """
@@ -362,10 +879,10 @@ class MemoryManager:
         Raises:
             MemoryAccessError: If opening the process fails
         """
-        handle = self.kernel32.OpenProcess(PROCESS_ALL_ACCESS, False, pid)
+        handle = self._OpenProcess(PROCESS_ALL_ACCESS, False, pid)
         if not handle:
             error_code = ctypes.get_last_error()
-            raise MemoryAccessError(f"Failed to open process (Error {error_code}): {ctypes.WinError(error_code)}")
+            raise MemoryAccessError("Failed to open process", error_code)
         
         return handle
     
@@ -380,7 +897,7 @@ class MemoryManager:
             True if process is 32-bit on 64-bit system
         """
         is_wow = wintypes.BOOL()
-        self.kernel32.IsWow64Process(handle, ctypes.byref(is_wow))
+        self._IsWow64Process(handle, ctypes.byref(is_wow))
         return bool(is_wow.value)
     
     def _get_module_info(self, handle: int, module_name: str) -> Optional[Tuple[int, int]]:
@@ -398,35 +915,39 @@ class MemoryManager:
             MemoryAccessError: If getting module information fails
         """
         try:
-            # Define MODULEINFO structure
-            class MODULEINFO(ctypes.Structure):
-                _fields_ = [
-                    ("lpBaseOfDll", wintypes.LPVOID),
-                    ("SizeOfImage", wintypes.DWORD),
-                    ("EntryPoint", wintypes.LPVOID),
-                ]
-            
-            # Enumerate modules
-            hMods = (wintypes.HMODULE * 1024)()
+            # Enumerate modules, starting from the size that fit last time
+            # and growing only if the process has more modules than that
+            capacity = self._hmod_capacity
             needed = wintypes.DWORD()
-            if not self.psapi.EnumProcessModules(
-                handle, ctypes.byref(hMods), ctypes.sizeof(hMods), ctypes.byref(needed)
-            ):
-                error_code = ctypes.get_last_error()
-                raise MemoryAccessError(f"Failed to enumerate modules (Error {error_code}): {ctypes.WinError(error_code)}")
+            while True:
+                hMods = (wintypes.HMODULE * capacity)()
+                if not self._EnumProcessModulesEx(
+                    handle, ctypes.byref(hMods), ctypes.sizeof(hMods), ctypes.byref(needed),
+                    LIST_MODULES_DEFAULT
+                ):
+                    error_code = ctypes.get_last_error()
+                    raise MemoryAccessError("Failed to enumerate modules", error_code)
+                
+                count = needed.value // _HMODULE_SIZE
+                if count <= capacity:
+                    break
+                capacity = count
+            self._hmod_capacity = capacity
             
-            # Find the target module
-            count = needed.value // ctypes.sizeof(wintypes.HMODULE)
+            # Find the target module; the main executable is listed first,
+            # so the usual case is answered by the first name lookup
+            target = module_name.lower()
+            name_buf = ctypes.create_unicode_buffer(256)
             for i in range(count):
                 mod = hMods[i]
-                name_buf = ctypes.create_unicode_buffer(256)
                 
-                self.psapi.GetModuleBaseNameW(handle, mod, name_buf, ctypes.sizeof(name_buf))
+                # nSize is in characters, not bytes
+                self._GetModuleBaseNameW(handle, mod, name_buf, len(name_buf))
                 
-                if name_buf.value.lower() == module_name.lower():
+                if name_buf.value.lower() == target:
                     # Get module information
-                    mi = MODULEINFO()
-                    self.psapi.GetModuleInformation(handle, mod, ctypes.byref(mi), ctypes.sizeof(mi))
+                    mi = _MODULEINFO()
+                    self._GetModuleInformation(handle, mod, ctypes.byref(mi), ctypes.sizeof(mi))
                     return mi.lpBaseOfDll, mi.SizeOfImage
             
             # Module not found
@@ -439,9 +960,10 @@ class MemoryManager:
     
     def _close_handle(self) -> None:
         """Close the process handle safely."""
+        self._alive_cache = None
         if hasattr(self, 'handle') and self.handle:
             try:
-                self.kernel32.CloseHandle(self.handle)
+                self._CloseHandle(self.handle)
                 self.logger.debug("Process handle closed")
             except Exception as e:
                 self.logger.warning(f"Error closing handle: {e}")
@@ -456,7 +978,7 @@ class MemoryManager:
             True if reconnection was successful
         """
         # Check if we tried reconnecting recently
-        current_time = time.time()
+        current_time = time.monotonic()
         if current_time - self.last_connect_attempt < self.reconnect_interval:
             return False
         
@@ -471,8 +993,20 @@ class MemoryManager:
             return False
     
     def _reconnection_monitor(self) -> None:
-        """Background thread for monitoring connection and reconnecting as needed."""
-        while not self.stop_monitoring:
+        """
+        Background thread for monitoring connection and reconnecting as needed.
+        
+        While connected it sleeps until a read fails with a disconnect-like
+        error (or monitor_idle_timeout elapses); while disconnected it retries
+        every reconnect_interval.
+        """
+        while not self._stop_event.is_set():
+            timeout = self.monitor_idle_timeout if self.connected else self.reconnect_interval
+            self._reconnect_event.wait(timeout=timeout)
+            self._reconnect_event.clear()
+            if self._stop_event.is_set():
+                break
+            
             try:
                 # Check if process is still running
                 if self.connected and not self.is_process_running():
@@ -481,38 +1015,12 @@ class MemoryManager:
                     self._close_handle()
                 
                 # Try to reconnect if disconnected
-                elif not self.connected:
+                if not self.connected:
                     if self._try_reconnect():
                         self.logger.info(f"Successfully reconnected to {self.module_name}")
             
             except Exception as e:
                 self.logger.error(f"Error in reconnection monitor: {e}")
-            
-            # Sleep for a while
-            for _ in range(10):  # Check stop flag more frequently
-                if self.stop_monitoring:
-                    break
-                time.sleep(0.1)
-    
-    def _clear_old_cache_entries(self, current_time: float) -> None:
-        """
-        Clear cache entries that have exceeded the timeout.
-        
-        Args:
-            current_time: Current time for comparison
-        """
-        # Find old entries
-        old_keys = [
-            key for key, timestamp in self.cache_timestamp.items()
-            if current_time - timestamp > self.cache_timeout
-        ]
-        
-        # Remove old entries
-        for key in old_keys:
-            if key in self.memory_cache:
-                del self.memory_cache[key]
-            if key in self.cache_timestamp:
-                del self.cache_timestamp[key]
 
 
 class SimpleMemoryManager:
@@ -530,13 +1038,16 @@ class SimpleMemoryManager:
         self.module_name = module_name
         self.logger = logging.getLogger(__name__)
         
-        # Initialize DLLs
-        self.kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        # Initialize DLLs (shared, already-prototyped bindings)
+        self.__dict__.update(_win_api())
         
         # Connection state
         self.pid = None
         self.handle = None
         
+        # Per-thread reusable read buffers (see _read_buffers)
+        self._tls = threading.local()
+        
         # Initialize
         self.initialize()
     
@@ -582,22 +1093,25 @@ class SimpleMemoryManager:
             MemoryAccessError: If reading fails
         """
         try:
-            # Create buffer for the data
-            buffer = data_type()
-            read = ctypes.c_size_t()
+            # Reuse this thread's buffer for the type
+            pool, read, pread = self._read_buffers()
+            entry = pool.get(data_type)
+            if entry is None:
+                entry = pool[data_type] = _new_read_buffer(pool, data_type)
+            buffer, pbuffer, size, unpack = entry
             
             # Read the memory
-            if not self.kernel32.ReadProcessMemory(
+            if not self._ReadProcessMemory(
                 self.handle, 
-                ctypes.c_void_p(address), 
-                ctypes.byref(buffer), 
-                ctypes.sizeof(buffer), 
-                ctypes.byref(read)
+                address, 
+                pbuffer, 
+                size, 
+                pread
             ):
                 error_code = ctypes.get_last_error()
-                raise MemoryAccessError(f"Read failed (Error {error_code}): {ctypes.WinError(error_code)}")
+                raise MemoryAccessError("Read failed", error_code)
             
-            return buffer.value
+            return unpack(buffer)[0] if unpack is not None else buffer.value
         
         except Exception as e:
             self.logger.error(f"Failed to read {hex(address)}: {e}")
@@ -605,6 +1119,127 @@ class SimpleMemoryManager:
                 raise
             raise MemoryAccessError(f"Failed to read memory at {hex(address)}: {e}")
     
+    def read_batch(self, items: List[Tuple[int, Type]]) -> List[Any]:
+        """
+        Read several small values, issuing one ReadProcessMemory per group of
+        values that share a memory page (e.g. the X/Y/Z coordinates).
+        
+        Args:
+            items: List of (address, data_type) pairs
+            
+        Returns:
+            Values read, in the same order as items
+            
+        Raises:
+            MemoryAccessError: If a span cannot be read
+        """
+        results: List[Any] = [None] * len(items)
+        pool, read, pread = self._read_buffers()
+        page_buf, ppage_buf = _page_buffer(pool)
+        
+        for start, end, indices in _page_spans(items):
+            if len(indices) == 1:
+                address, data_type = items[indices[0]]
+                results[indices[0]] = self.read_memory(address, data_type)
+                continue
+            
+            size = end - start
+            if not self._ReadProcessMemory(
+                self.handle, 
+                start, 
+                ppage_buf, 
+                size, 
+                pread
+            ) or read.value != size:
+                error_code = ctypes.get_last_error()
+                self.logger.error(f"Failed to read {size} bytes at {hex(start)}")
+                raise MemoryAccessError(f"Failed to read memory at {hex(start)}", error_code)
+            
+            _decode_span(page_buf, start, items, indices, results)
+        
+        return results
+    
+    def make_batch_reader(self, items: List[Tuple[int, Type]],
+                          changed_only: bool = False) -> Callable[..., Optional[List[Any]]]:
+        """
+        Build a reader specialized for a fixed set of values (e.g. the X/Y/Z
+        coordinates). Page spans, buffers and unpackers are resolved once, so
+        each call only issues the ReadProcessMemory calls and unpacks.
+        
+        The returned reader owns its buffers: call it from one thread at a time.
+        
+        Args:
+            items: List of (address, data_type) pairs
+            changed_only: If True, the reader compares the raw bytes with the
+                previous call and returns None (skipping the unpacking) when
+                nothing changed, unless called with force=True
+            
+        Returns:
+            Callable (optional force flag) returning the values read, in the
+            same order as items, or None when unchanged
+            
+        Raises:
+            MemoryAccessError: (from the reader) If a span cannot be read
+        """
+        items = list(items)
+        count = len(items)
+        plan = []
+        for start, end, indices in _page_spans(items):
+            size = end - start
+            buffer = ctypes.create_string_buffer(size)
+            fields = []
+            for i in indices:
+                address, data_type = items[i]
+                unpack = _FAST_UNPACK.get(data_type)
+                if unpack is None:
+                    unpack = lambda buf, offset, t=data_type: (t.from_buffer_copy(buf, offset).value,)
+                fields.append((i, address - start, unpack))
+            plan.append((start, size, buffer, ctypes.byref(buffer), fields))
+        
+        read = ctypes.c_size_t()
+        pread = ctypes.byref(read)
+        rpm = self._ReadProcessMemory
+        
+        last_raw: List[Optional[bytes]] = [None] * len(plan)
+        
+        def read_values(force: bool = False) -> Optional[List[Any]]:
+            changed = force or not changed_only
+            for k, (start, size, buffer, pbuffer, _) in enumerate(plan):
+                if not rpm(self.handle, start, pbuffer, size, pread) or read.value != size:
+                    error_code = ctypes.get_last_error()
+                    raise MemoryAccessError(f"Failed to read memory at {hex(start)}", error_code)
+                if changed_only:
+                    raw = buffer.raw
+                    if raw != last_raw[k]:
+                        last_raw[k] = raw
+                        changed = True
+            if not changed:
+                return None
+            
+            results: List[Any] = [None] * count
+            for _, _, buffer, _, fields in plan:
+                for i, offset, unpack in fields:
+                    results[i] = unpack(buffer, offset)[0]
+            return results
+        
+        return read_values
+    
+    def _read_buffers(self) -> Tuple[Dict[Type, Tuple[Any, Any, int, Any]], ctypes.c_size_t, Any]:
+        """
+        Get the calling thread's buffer pool (one entry per data type, see
+        _new_read_buffer) and bytes-read counter, creating them on first use.
+        
+        Returns:
+            Tuple of (buffer pool, bytes-read counter, byref to the counter)
+        """
+        tls = self._tls
+        try:
+            return tls.pool, tls.read, tls.pread
+        except AttributeError:
+            tls.pool, tls.read = {}, ctypes.c_size_t()
+            tls.pread = ctypes.byref(tls.read)
+            return tls.pool, tls.read, tls.pread
+    
     def resolve_pointer_chain(self, base_address: int, offsets: List[int]) -> int:
         """
         Resolve a pointer chain starting from the base address.
@@ -644,11 +1279,7 @@ class SimpleMemoryManager:
         if self.pid is None:
             return False
         
-        try:
-            process = psutil.Process(self.pid)
-            return process.is_running() and process.name().lower() == self.module_name.lower()
-        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-            return False
+        return _is_pid_alive(self, self.pid, self.handle)
     
     def _find_process_pid(self) -> Optional[int]:
         """
@@ -657,14 +1288,7 @@ class SimpleMemoryManager:
         Returns:
             Process ID or None if not found
         """
-        for proc in psutil.process_iter(['name', 'pid']):
-            try:
-                if proc.info['name'] and proc.info['name'].lower() == self.module_name.lower():
-                    return proc.info['pid']
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                continue
-        
-        return None
+        return _find_pid_by_name(self, self.module_name)
     
     def _open_process(self, pid: int) -> int:
         """
@@ -679,10 +1303,10 @@ class SimpleMemoryManager:
         Raises:
             MemoryAccessError: If opening the process fails
         """
-        handle = self.kernel32.OpenProcess(PROCESS_ALL_ACCESS, False, pid)
+        handle = self._OpenProcess(PROCESS_ALL_ACCESS, False, pid)
         if not handle:
             error_code = ctypes.get_last_error()
-            raise MemoryAccessError(f"Failed to open process (Error {error_code}): {ctypes.WinError(error_code)}")
+            raise MemoryAccessError("Failed to open process", error_code)
         
         return handle
     
@@ -690,7 +1314,7 @@ class SimpleMemoryManager:
         """Close the process handle safely."""
         if hasattr(self, 'handle') and self.handle:
             try:
-                self.kernel32.CloseHandle(self.handle)
+                self._CloseHandle(self.handle)
                 self.logger.debug("Process handle closed")
             except Exception as e:
                 self.logger.warning(f"Error closing handle: {e}")
@@ -1,10 +1,11 @@
 """
 Módulo simplificado de movimentação - Sem tratamento de obstáculos
 """
+import atexit
 import time
 import keyboard
 import ctypes
-from typing import Dict, List
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
 
 # Importar módulos necessários
 import sys
@@ -21,122 +22,258 @@ sys.path.insert(0, os.path.join(project_root, 'memory'))
 from memory_manager import SimpleMemoryManager
 from config_utils import get_config
 from logging_utils import get_logger
+from input_utils import send_keys
 
+_perf_counter = time.perf_counter
 
-def get_direction(cur: Dict[str, int], nxt: Dict[str, int]) -> List[str]:
+# Margem final de _sleep_until resolvida em espera ativa, abaixo da
+# granularidade do time.sleep
+_SPIN_MARGIN = 0.001
+
+_timer_period_set = False
+
+
+def _enable_fine_timer() -> None:
+    """
+    Pede ao Windows resolução de 1 ms para o timer do sistema (o padrão
+    chega a ~15 ms), restaurando-a ao sair. Sem efeito fora do Windows.
+    """
+    global _timer_period_set
+    if _timer_period_set:
+        return
+    winmm = getattr(ctypes, 'windll', None) and ctypes.windll.winmm
+    if winmm and winmm.timeBeginPeriod(1) == 0:
+        _timer_period_set = True
+        atexit.register(winmm.timeEndPeriod, 1)
+
+
+def _sleep_until(deadline: float) -> None:
+    """
+    Dorme até o instante absoluto deadline (em perf_counter), sem acumular
+    os atrasos de vários time.sleep seguidos.
+    
+    Args:
+        deadline: Instante alvo em segundos de perf_counter
+    """
+    remaining = deadline - _perf_counter()
+    if remaining > _SPIN_MARGIN:
+        time.sleep(remaining - _SPIN_MARGIN)
+    while _perf_counter() < deadline:
+        pass
+
+
+class Pos(NamedTuple):
+    """
+    Posição no mapa. Tupla imutável: acesso por atributo, sem hash por chave
+    como nos dicionários {x, y, z} que vêm dos arquivos de caminho.
+    """
+    x: int
+    y: int
+    z: Optional[int] = None
+
+
+def as_pos(point: Union[Pos, Dict[str, Any]]) -> Pos:
+    """
+    Converte um ponto {x, y, [z]} (ou uma Pos já pronta) em Pos.
+    Usado apenas nas bordas: entrada de caminhos e leituras de memória.
+    """
+    if type(point) is Pos:
+        return point
+    return Pos(point['x'], point['y'], point.get('z'))
+
+
+def pos_to_dict(pos: Pos) -> Dict[str, int]:
+    """
+    Converte uma Pos no formato {x, y, [z]} usado nos arquivos JSON.
+    """
+    if pos.z is None:
+        return {'x': pos.x, 'y': pos.y}
+    return {'x': pos.x, 'y': pos.y, 'z': pos.z}
+
+
+# Quantas vezes move_to refaz a decomposição de um trecho após ressincronizar
+_MAX_RESYNCS = 3
+
+
+# Teclas por direção, indexadas por (sinal de dx, sinal de dy).
+# Vertical (w/s) antes da horizontal (d/a), como na ordem original
+_DIR_TABLE: Dict[Tuple[int, int], Tuple[str, ...]] = {
+    (-1, -1): ('w', 'a'),  # Noroeste
+    (0, -1): ('w',),       # Norte
+    (1, -1): ('w', 'd'),   # Nordeste
+    (-1, 0): ('a',),       # Oeste
+    (0, 0): (),
+    (1, 0): ('d',),        # Leste
+    (-1, 1): ('s', 'a'),   # Sudoeste
+    (0, 1): ('s',),        # Sul
+    (1, 1): ('s', 'd'),    # Sudeste
+}
+
+
+def get_direction(cur: Pos, nxt: Pos) -> Tuple[str, ...]:
     """
     Determina teclas de direção para mover de uma posição para outra.
     
     Args:
-        cur: Posição atual {x, y}
-        nxt: Próxima posição {x, y}
+        cur: Posição atual
+        nxt: Próxima posição
         
     Returns:
-        Lista de teclas a pressionar (w, a, s, d)
+        Tupla (compartilhada, não modificar) de teclas a pressionar (w, a, s, d)
     """
-    dx, dy = nxt['x'] - cur['x'], nxt['y'] - cur['y']
-    keys: List[str] = []
-    if dy < 0: keys.append('w')  # Norte
-    if dy > 0: keys.append('s')  # Sul
-    if dx > 0: keys.append('d')  # Leste
-    if dx < 0: keys.append('a')  # Oeste
-    return keys
+    dx, dy = nxt.x - cur.x, nxt.y - cur.y
+    return _DIR_TABLE[(dx > 0) - (dx < 0), (dy > 0) - (dy < 0)]
 
 
-def break_into_single_steps(start: Dict[str, int], end: Dict[str, int]) -> List[Dict[str, int]]:
+def break_into_single_steps(start: Pos, end: Pos) -> List[Pos]:
     """
     Quebra um movimento de múltiplos SQMs em passos de 1 SQM.
     
     Args:
-        start: Posição inicial {x, y, [z]}
-        end: Posição final {x, y, [z]}
+        start: Posição inicial
+        end: Posição final
         
     Returns:
         Lista de posições intermediárias de 1 SQM cada
     """
-    steps = []
-    current_x, current_y = start['x'], start['y']
-    target_x, target_y = end['x'], end['y']
+    x0, y0 = start.x, start.y
+    dx, dy = end.x - x0, end.y - y0
+    sx, sy = (dx > 0) - (dx < 0), (dy > 0) - (dy < 0)
+    adx, ady = abs(dx), abs(dy)
     
     # Incluir z se disponível
-    z = start.get('z', end.get('z'))
+    z = start.z if start.z is not None else end.z
     
-    while current_x != target_x or current_y != target_y:
-        # Mover primeiro na diagonal se possível
-        next_x = current_x
-        next_y = current_y
-        
-        if current_x < target_x and current_y < target_y:
-            # Diagonal sudeste
-            next_x += 1
-            next_y += 1
-        elif current_x < target_x and current_y > target_y:
-            # Diagonal nordeste
-            next_x += 1
-            next_y -= 1
-        elif current_x > target_x and current_y < target_y:
-            # Diagonal sudoeste
-            next_x -= 1
-            next_y += 1
-        elif current_x > target_x and current_y > target_y:
-            # Diagonal noroeste
-            next_x -= 1
-            next_y -= 1
-        elif current_x < target_x:
-            # Apenas leste
-            next_x += 1
-        elif current_x > target_x:
-            # Apenas oeste
-            next_x -= 1
-        elif current_y < target_y:
-            # Apenas sul
-            next_y += 1
-        elif current_y > target_y:
-            # Apenas norte
-            next_y -= 1
-        
-        step = {'x': next_x, 'y': next_y}
-        if z is not None:
-            step['z'] = z
-        
-        steps.append(step)
-        current_x, current_y = next_x, next_y
+    # Primeiro os passos diagonais (enquanto os dois eixos diferem), depois
+    # os retos no eixo restante: as coordenadas saem direto da contagem,
+    # sem simular passo a passo
+    diag = min(adx, ady)
+    coords = [(x0 + sx * i, y0 + sy * i) for i in range(1, diag + 1)]
+    xd, yd = x0 + sx * diag, y0 + sy * diag
+    if adx > diag:
+        coords.extend((xd + sx * i, yd) for i in range(1, adx - diag + 1))
+    else:
+        coords.extend((xd, yd + sy * i) for i in range(1, ady - diag + 1))
     
-    return steps
+    return [Pos(x, y, z) for x, y in coords]
 
 
-def get_coordinates_from_memory(memory, config_path="config/config.json") -> Dict[str, int]:
+def get_coordinate_addrs(config) -> Tuple[int, int, Optional[int]]:
     """
-    Obtém as coordenadas atuais do personagem a partir da memória.
-    Versão simplificada sem mapeamento de eixos.
-    """
-    config = get_config(config_path)
-    include_z = config.get("include_z", True)
-    
-    # Resolver endereços para cada eixo
-    pointer_chains = config.get_pointer_chains()
+    Endereços de X, Y e Z a ler, respeitando include_z. Resolvido uma vez
+    por quem chama get_coordinates_from_memory, não a cada leitura.
     
-    # Usar endereços base diretamente (SimpleMemoryManager)
-    addr_x = pointer_chains['x']['base_offset']
-    addr_y = pointer_chains['y']['base_offset']
-    addr_z = pointer_chains['z']['base_offset'] if include_z else None
+    Args:
+        config: Instância do ConfigManager
+        
+    Returns:
+        Tupla (addr_x, addr_y, addr_z); addr_z é None se Z não for lido
+    """
+    addr_x, addr_y, addr_z = config.xyz_addrs
+    if not config.get("include_z", True):
+        addr_z = None
+    return addr_x, addr_y, addr_z
+
+
+def read_position(memory, addr_x: int, addr_y: int, addr_z: Optional[int] = None) -> Pos:
+    """
+    Lê a posição atual do personagem da memória como Pos.
     
-    # Ler valores da memória diretamente
+    Args:
+        memory: Gerenciador de memória conectado ao jogo
+        addr_x: Endereço base de X
+        addr_y: Endereço base de Y
+        addr_z: Endereço base de Z, ou None para não ler Z
+        
+    Returns:
+        Posição lida (z é None se Z não foi lido)
+    """
+    # Ler os eixos de uma vez: endereços na mesma página de memória saem
+    # numa única chamada a ReadProcessMemory
     try:
-        x = memory.read_memory(addr_x, ctypes.c_int32)
-        y = memory.read_memory(addr_y, ctypes.c_int32)
+        if addr_z:
+            return Pos(*memory.read_batch(
+                [(addr_x, ctypes.c_int32), (addr_y, ctypes.c_int32), (addr_z, ctypes.c_int32)]
+            ))
         
-        pos = {'x': x, 'y': y}
-        if include_z and addr_z:
-            pos['z'] = memory.read_memory(addr_z, ctypes.c_int32)
-            
-        return pos
+        return Pos(*memory.read_batch([(addr_x, ctypes.c_int32), (addr_y, ctypes.c_int32)]))
     except Exception as e:
         logger = get_logger(__name__)
         logger.error(f"Erro ao ler coordenadas: {e}")
         raise
 
 
+def make_position_reader(memory, addr_x: int, addr_y: int, addr_z: Optional[int] = None,
+                         changed_only: bool = False) -> Callable[..., Optional[Pos]]:
+    """
+    Gera um leitor de posição especializado para endereços fixos.
+    
+    Quando o gerenciador de memória oferece make_batch_reader, páginas,
+    buffers e conversões são resolvidos uma vez aqui, e cada chamada só faz
+    as leituras. Caso contrário, o leitor delega para read_position.
+    
+    Args:
+        memory: Gerenciador de memória conectado ao jogo
+        addr_x: Endereço base de X
+        addr_y: Endereço base de Y
+        addr_z: Endereço base de Z, ou None para não ler Z
+        changed_only: Devolver None quando a posição não mudou desde a última
+            leitura (compara os bytes lidos, sem converter); force=True na
+            chamada devolve a posição de qualquer forma
+        
+    Returns:
+        Função (force opcional) que devolve a posição atual (z é None se Z
+        não é lido), ou None se changed_only e nada mudou
+    """
+    make_batch_reader = getattr(memory, "make_batch_reader", None)
+    if make_batch_reader is None:
+        if not changed_only:
+            return lambda force=False: read_position(memory, addr_x, addr_y, addr_z)
+        
+        last: List[Optional[Pos]] = [None]
+        
+        def read_changed(force: bool = False) -> Optional[Pos]:
+            pos = read_position(memory, addr_x, addr_y, addr_z)
+            if not force and pos == last[0]:
+                return None
+            last[0] = pos
+            return pos
+        
+        return read_changed
+    
+    items = [(addr_x, ctypes.c_int32), (addr_y, ctypes.c_int32)]
+    if addr_z:
+        items.append((addr_z, ctypes.c_int32))
+    read_values = make_batch_reader(items, changed_only)
+    
+    def read(force: bool = False) -> Optional[Pos]:
+        try:
+            values = read_values(force)
+            return None if values is None else Pos(*values)
+        except Exception as e:
+            get_logger(__name__).error(f"Erro ao ler coordenadas: {e}")
+            raise
+    
+    return read
+
+
+def get_coordinates_from_memory(memory, addr_x: int, addr_y: int, addr_z: Optional[int] = None) -> Dict[str, int]:
+    """
+    Obtém as coordenadas atuais do personagem a partir da memória.
+    Versão simplificada sem mapeamento de eixos.
+    
+    Args:
+        memory: Gerenciador de memória conectado ao jogo
+        addr_x: Endereço base de X
+        addr_y: Endereço base de Y
+        addr_z: Endereço base de Z, ou None para não ler Z
+        
+    Returns:
+        Posição {x, y, [z]}
+    """
+    return pos_to_dict(read_position(memory, addr_x, addr_y, addr_z))
+
+
 class SimpleMovementManager:
     """
     Gerenciador de movimentos simplificado - movimento fiel ao caminho gravado.
@@ -161,6 +298,10 @@ class SimpleMovementManager:
         self.key_press_duration = 0.02  # Tempo que a tecla fica pressionada (20ms)
         self.movement_wait_time = 0.15  # Tempo para esperar o movimento (150ms)
         self.post_move_delay = 0.05    # Delay mínimo após movimento (50ms)
+        self.key_stagger = 0.01        # Intervalo entre teclas no modo suave (10ms)
+        
+        # Os tempos acima são agendados por prazos absolutos; pedir timer fino
+        _enable_fine_timer()
         
         self.logger.info(f"Configurações de movimento: press={self.key_press_duration}s, wait={self.movement_wait_time}s, delay={self.post_move_delay}s")
         
@@ -170,43 +311,54 @@ class SimpleMovementManager:
             axis: info['base_offset']
             for axis, info in pointer_chains.items()
         }
+        self._addr_x, self._addr_y, self._addr_z = get_coordinate_addrs(self.config)
         
         # Estado da navegação
         self.current_pos = None
+        self._last_known_pos: Optional[Pos] = None  # Posição assumida após cada passo
         self.movement_count = 0  # Contador de movimentos para log
+        
+        # Conferir a posição real na memória a cada N passos (0 desativa),
+        # em vez de confiar sempre na posição assumida
+        self._verify_every = self.config.get("movement_verify_every", 4)
+        self._steps_since_verify = 0
     
-    def update_position(self) -> Dict[str, int]:
+    def update_position(self) -> Pos:
         """
         Atualiza a posição atual lendo da memória.
         """
         try:
-            pos = get_coordinates_from_memory(self.memory, self.config.config_path)
+            pos = read_position(self.memory, self._addr_x, self._addr_y, self._addr_z)
             self.current_pos = pos
             return pos
         except Exception as e:
             self.logger.error(f"Erro ao ler posição atual: {e}")
             raise
     
-    def move_to_single_sqm(self, target: Dict[str, int], smooth_mode: bool = True) -> bool:
+    def move_to_single_sqm(self, target: Pos, smooth_mode: bool = True,
+                           settle: float = 0.0) -> bool:
         """
         Move o personagem exatamente 1 SQM na direção do alvo.
         
+        Todos os tempos do passo (teclas, espera do movimento e settle) são
+        prazos contados a partir do primeiro pressionamento.
+        
         Args:
-            target: Posição alvo {x, y, [z]} (deve estar a 1 SQM de distância)
+            target: Posição alvo (deve estar a 1 SQM de distância)
             smooth_mode: Se True, usa movimento mais suave
+            settle: Pausa extra após o movimento, somada ao mesmo prazo
             
         Returns:
             True se o movimento foi executado
         """
         # Não atualizar posição a cada movimento para economizar tempo
-        if not hasattr(self, '_last_known_pos'):
-            self.update_position()
-            self._last_known_pos = self.current_pos
+        if self._last_known_pos is None:
+            self._last_known_pos = self.update_position()
         
         current = self._last_known_pos
         
         # Verificar se já está no alvo
-        if current['x'] == target['x'] and current['y'] == target['y']:
+        if current.x == target.x and current.y == target.y:
             return True
             
         # Determinar teclas
@@ -215,73 +367,107 @@ class SimpleMovementManager:
             return True
             
         # Log simplificado
-        self.movement_count += 1
-        if self.movement_count % 10 == 1:  # Log ainda menos frequente
-            self.logger.info(f"Progresso: {self.movement_count} movimentos...")
+        count = self.movement_count = self.movement_count + 1
+        if count % 10 == 1:  # Log ainda menos frequente
+            self.logger.info(f"Progresso: {count} movimentos...")
         
-        # Executar movimento suave
+        # No modo suave as teclas entram/saem escalonadas (mais natural);
+        # no rápido, todas juntas num único SendInput
         if smooth_mode:
-            # Simular pressionamento mais natural
-            for k in keys:
-                keyboard.press(k)
-                time.sleep(0.01)  # Micro delay entre teclas
-            
-            time.sleep(self.key_press_duration)
-            
-            for k in keys:
-                keyboard.release(k)
-                time.sleep(0.01)  # Micro delay entre teclas
+            stagger = self.key_stagger
+            groups = [(k,) for k in keys]
         else:
-            # Movimento rápido
-            for k in keys:
-                keyboard.press(k)
-            time.sleep(self.key_press_duration)
-            for k in keys:
-                keyboard.release(k)
+            stagger = 0.0
+            groups = [keys]
+        send = self._send
+        sleep_until = _sleep_until
+        tail = len(keys) * stagger
+        t0 = _perf_counter()
+        
+        for i, group in enumerate(groups):
+            if i:
+                sleep_until(t0 + i * stagger)
+            send(group, False)
+        
+        release_at = t0 + tail + self.key_press_duration
+        for i, group in enumerate(groups):
+            sleep_until(release_at + i * stagger)
+            send(group, True)
         
-        # Aguardar movimento
-        time.sleep(self.movement_wait_time)
+        # Aguardar movimento (e a pausa pedida por quem chamou)
+        sleep_until(release_at + tail + self.movement_wait_time + settle)
         
         # Atualizar posição assumida
         self._last_known_pos = target
         
+        steps = self._steps_since_verify = self._steps_since_verify + 1
+        if steps >= self._verify_every > 0:
+            self._verify_position()
+        
         return True
     
-    def move_to(self, target: Dict[str, int]) -> bool:
+    def _verify_position(self) -> None:
+        """
+        Confere a posição assumida com uma leitura (em lote) da memória e
+        ressincroniza se o personagem não estiver onde se esperava.
+        """
+        self._steps_since_verify = 0
+        expected = self._last_known_pos
+        try:
+            actual = self.update_position()
+        except Exception:
+            return  # Erro já registrado; seguir com a posição assumida
+        
+        if actual.x != expected.x or actual.y != expected.y:
+            self.logger.warning(
+                f"Posição divergente: esperado ({expected.x}, {expected.y}), "
+                f"real ({actual.x}, {actual.y}). Ressincronizando."
+            )
+            self._last_known_pos = actual
+    
+    @staticmethod
+    def _send(keys: Tuple[str, ...], release: bool) -> None:
+        """
+        Pressiona ou solta as teclas via SendInput (scancodes, uma chamada),
+        recorrendo ao pacote keyboard se SendInput não estiver disponível.
+        """
+        if send_keys(keys, release):
+            return
+        action = keyboard.release if release else keyboard.press
+        for k in keys:
+            action(k)
+    
+    def move_to(self, target: Union[Pos, Dict[str, Any]]) -> bool:
         """
         Move o personagem para a posição alvo de forma suave.
         
         Args:
-            target: Posição alvo {x, y, [z]}
+            target: Posição alvo (Pos ou {x, y, [z]})
             
         Returns:
             True se executou o movimento
         """
+        target = as_pos(target)
+        
         # Usar posição conhecida ou atualizar
-        if not hasattr(self, '_last_known_pos'):
-            self.update_position()
-            self._last_known_pos = self.current_pos
+        if self._last_known_pos is None:
+            self._last_known_pos = self.update_position()
         
         current = self._last_known_pos
         
         # Verificar se já está na posição alvo
-        if current['x'] == target['x'] and current['y'] == target['y']:
+        if current.x == target.x and current.y == target.y:
             return True
         
         # Calcular distância
-        dx = abs(target['x'] - current['x'])
-        dy = abs(target['y'] - current['y'])
+        dx = abs(target.x - current.x)
+        dy = abs(target.y - current.y)
         total_dist = max(dx, dy)
         
         # Para caminhos gravados, esperamos movimentos de 1 SQM
         if total_dist == 1:
-            # Movimento simples de 1 SQM
-            result = self.move_to_single_sqm(target, smooth_mode=True)
-            
-            # Pausa mínima entre movimentos
-            time.sleep(self.post_move_delay)
-            
-            return result
+            # Movimento simples de 1 SQM, com pausa mínima entre movimentos
+            return self.move_to_single_sqm(target, smooth_mode=True, settle=self.post_move_delay)
             
         else:
             # Distância maior - precisa quebrar em passos
@@ -291,14 +477,58 @@ class SimpleMovementManager:
             # Obter passos intermediários
             steps = break_into_single_steps(current, target)
             
-            # Executar cada passo
-            for step in steps:
-                self.move_to_single_sqm(step, smooth_mode=True)
-                # Micro pausa entre passos múltiplos
-                time.sleep(0.02)
+            # Executar cada passo (com micro pausa entre passos múltiplos). Se
+            # uma conferência ressincronizar a posição assumida, o resto do
+            # trecho é decomposto de novo a partir da posição real (no máximo
+            # _MAX_RESYNCS vezes, para não insistir num personagem bloqueado)
+            i = 0
+            resyncs = 0
+            while i < len(steps):
+                step = steps[i]
+                self.move_to_single_sqm(step, smooth_mode=True, settle=0.02)
+                if self._last_known_pos != step and resyncs < _MAX_RESYNCS:
+                    resyncs += 1
+                    steps = break_into_single_steps(self._last_known_pos, target)
+                    i = 0
+                else:
+                    i += 1
             
             return True
     
+    def move_to_many(self, targets: Sequence[Pos],
+                     on_step: Optional[Callable[[int, bool], bool]] = None) -> int:
+        """
+        Move o personagem por uma sequência de alvos, na ordem, como várias
+        chamadas a move_to numa só: a posição inicial é lida (se preciso)
+        uma única vez e os alvos já chegam convertidos.
+        
+        Args:
+            targets: Alvos em ordem (normalmente vizinhos de 1 SQM)
+            on_step: Chamado após cada alvo com (índice, sucesso); se
+                retornar False, a sequência é interrompida
+            
+        Returns:
+            Quantidade de alvos processados
+        """
+        if self._last_known_pos is None:
+            self._last_known_pos = self.update_position()
+        
+        move_to = self.move_to
+        move_single = self.move_to_single_sqm
+        settle = self.post_move_delay
+        done = 0
+        for i, target in enumerate(targets):
+            current = self._last_known_pos
+            # Caso comum (1 SQM) direto; o resto segue as regras de move_to
+            if max(abs(target.x - current.x), abs(target.y - current.y)) == 1:
+                ok = move_single(target, True, settle)
+            else:
+                ok = move_to(target)
+            done = i + 1
+            if on_step is not None and not on_step(i, ok):
+                break
+        return done
+    
     def follow_path(self, path: List[Dict[str, int]], repeat: int = 1, interval: float = 2.0) -> bool:
         """
         Segue um caminho pré-definido - versão simplificada.
@@ -315,8 +545,11 @@ class SimpleMovementManager:
             self.logger.warning("Caminho vazio ou com apenas um ponto")
             return False
         
-        # Atualizar posição atual
-        self.update_position()
+        # Atualizar posição atual (também ponto de partida dos passos)
+        self._last_known_pos = self.update_position()
+        
+        # Os pontos do arquivo viram Pos uma única vez, aqui
+        targets = [as_pos(p) for p in path[1:]]
         
         # Loop de repetição
         iteration = 1
@@ -325,10 +558,11 @@ class SimpleMovementManager:
             if repeat != 1:
                 self.logger.info(f"Executando caminho - Iteração {iteration}")
             
-            # Executar caminho
-            for i in range(len(path) - 1):
-                target = path[i+1]
-                self.move_to(target)
+            # Cada trecho parte da posição assumida, que as conferências
+            # periódicas mantêm alinhada com a posição real
+            move_to = self.move_to
+            for target in targets:
+                move_to(target)
                 
             # Aguardar antes da próxima repetição
             if repeat < 0 or iteration < repeat:
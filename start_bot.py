@@ -6,11 +6,11 @@ Sistema Otimizado com Priorização Diagonal
 import os
 import sys
 import time
-import json
 import subprocess
 import re
+from collections import Counter
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Tuple
 
 # Garantir que o diretório atual é o diretório do script
 os.chdir(os.path.dirname(os.path.abspath(__file__)))
@@ -18,15 +18,70 @@ os.chdir(os.path.dirname(os.path.abspath(__file__)))
 # Configurar sistema de logging ANTES de tudo
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'utils'))
 from logging_utils import setup_file_logging, get_logger
+from path_codec import binary_data_file, load_path, rename_path
 setup_file_logging()  # Configura arquivo de log
 logger = get_logger(__name__)
 logger.info("="*60)
 logger.info("PokeTibia Bot iniciado")
 logger.info("="*60)
 
+# Caracteres não permitidos em nomes de arquivo no Windows
+_INVALID_FN_RE = re.compile(r'[<>:"/\\|?*]')
+
+# Os módulos filhos escrevem em UTF-8 no pipe (sem isso, o Windows usa a
+# página de código local), o mesmo que o console espera em sys.stdout.buffer
+_CHILD_ENV = {**os.environ, "PYTHONIOENCODING": "utf-8"}
+
+def _pipe_to_stdout(process: subprocess.Popen) -> None:
+    """
+    Repassa a saída do processo filho para o terminal em blocos de bytes,
+    à medida que chega, e aguarda o término do processo.
+    """
+    fd = process.stdout.fileno()
+    out = sys.stdout.buffer
+    sys.stdout.flush()
+    while True:
+        chunk = os.read(fd, 65536)
+        if not chunk:
+            break
+        out.write(chunk)
+        out.flush()
+    process.wait()
+
+def _enable_ansi() -> bool:
+    """
+    Habilita sequências ANSI (modo VT) no console, uma única vez.
+    
+    Returns:
+        True se o terminal aceita códigos ANSI
+    """
+    if not sys.stdout.isatty():
+        return False
+    if os.name != 'nt':
+        return True
+    try:
+        import ctypes
+        from ctypes import wintypes
+        kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+        mode = wintypes.DWORD()
+        if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            return False
+        # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+        return bool(kernel32.SetConsoleMode(handle, mode.value | 0x0004))
+    except Exception:
+        return False
+
+_ANSI_ENABLED = _enable_ansi()
+
 def clear_screen():
     """Limpa a tela do terminal."""
-    os.system('cls' if os.name == 'nt' else 'clear')
+    if _ANSI_ENABLED:
+        # Limpar e posicionar o cursor no topo sem criar um processo
+        sys.stdout.write('\x1b[2J\x1b[H')
+        sys.stdout.flush()
+    else:
+        os.system('cls' if os.name == 'nt' else 'clear')
 
 def print_header():
     """Exibe o cabeçalho do bot."""
@@ -66,14 +121,8 @@ def start_recording():
         
         try:
             # Executar mostrando a saída em tempo real
-            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, 
-                                     universal_newlines=True, bufsize=1)
-            
-            # Mostrar saída linha por linha
-            for line in process.stdout:
-                print(line, end='')
-                
-            process.wait()
+            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, env=_CHILD_ENV)
+            _pipe_to_stdout(process)
             print("\n🔄 Gravação finalizada, retornando ao menu...")
             time.sleep(1)
         except KeyboardInterrupt:
@@ -86,27 +135,49 @@ def start_recording():
     
     # Retorna automaticamente ao menu principal
 
-def list_recorded_paths() -> List[str]:
-    """Lista os caminhos gravados disponíveis."""
-    paths = []
+def _scan_json(directory: str) -> List[os.DirEntry]:
+    """Lista os arquivos .json de um diretório (vazio se não existir)."""
+    try:
+        with os.scandir(directory) as it:
+            return [entry for entry in it if entry.name.endswith(".json") and entry.is_file()]
+    except OSError:
+        return []
+
+def scan_recorded_paths() -> List[Tuple[str, os.stat_result]]:
+    """
+    Lista os caminhos gravados junto com o stat de cada arquivo, obtido
+    na própria varredura do diretório (sem stat extra por arquivo).
+    
+    Returns:
+        Lista de (caminho, stat), do mais recente para o mais antigo
+    """
+    found = []
     
     # Verificar na pasta 'paths' primeiro
     paths_dir = "paths"
-    if os.path.exists(paths_dir) and os.path.isdir(paths_dir):
-        for file in os.listdir(paths_dir):
-            if file.endswith(".json"):
-                paths.append(os.path.join(paths_dir, file))
+    saved_names = set()
+    for entry in _scan_json(paths_dir):
+        saved_names.add(entry.name)
+        found.append((os.path.join(paths_dir, entry.name), entry.stat()))
     
     # Verificar também no diretório atual para compatibilidade
-    for file in os.listdir():
-        if file.endswith(".json") and (file.startswith("path_") or not os.path.exists(os.path.join("paths", file))):
-            full_path = os.path.abspath(file)
-            if full_path not in [os.path.abspath(p) for p in paths]:
-                paths.append(file)
+    # (caminhos normalizados num conjunto para evitar duplicatas)
+    seen = {os.path.normcase(os.path.abspath(p)) for p, _ in found}
+    for entry in _scan_json("."):
+        file = entry.name
+        if file.startswith("path_") or file not in saved_names:
+            key = os.path.normcase(os.path.abspath(file))
+            if key not in seen:
+                seen.add(key)
+                found.append((file, entry.stat()))
     
     # Ordenar por data de modificação (mais recente primeiro)
-    paths.sort(key=lambda x: os.path.getmtime(x), reverse=True)
-    return paths
+    found.sort(key=lambda item: item[1].st_mtime, reverse=True)
+    return found
+
+def list_recorded_paths() -> List[str]:
+    """Lista os caminhos gravados disponíveis."""
+    return [path for path, _ in scan_recorded_paths()]
 
 def play_path():
     """Reproduz um caminho gravado."""
@@ -152,14 +223,8 @@ def play_path():
             cmd[0] = python_exe
             try:
                 # Executar mostrando a saída em tempo real
-                process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, 
-                                         universal_newlines=True, bufsize=1)
-                
-                # Mostrar saída linha por linha
-                for line in process.stdout:
-                    print(line, end='')
-                    
-                process.wait()
+                process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, env=_CHILD_ENV)
+                _pipe_to_stdout(process)
                 print("\n🔄 Reprodução finalizada, retornando ao menu...")
                 time.sleep(1)
             except KeyboardInterrupt:
@@ -199,7 +264,7 @@ def rename_path_file(current_path: str):
             return
         
         # Limpar nome (remover caracteres inválidos)
-        new_name = re.sub(r'[<>:"/\\|?*]', '_', new_name)
+        new_name = _INVALID_FN_RE.sub('_', new_name)
         new_filename = f"{new_name}.json"
         
         # Determinar novo caminho completo
@@ -218,9 +283,9 @@ def rename_path_file(current_path: str):
                 print("\nOperação cancelada.")
                 return
         
-        # Renomear arquivo
+        # Renomear arquivo (e o .bin, se o caminho for binário)
         try:
-            os.rename(current_path, new_path)
+            rename_path(current_path, new_path)
             print(f"✅ Arquivo renomeado para: {new_filename}")
             time.sleep(1.5)
         except Exception as e:
@@ -237,24 +302,28 @@ def display_paths():
         print_header()
         print("Caminhos Gravados:\n")
         
-        paths = list_recorded_paths()
+        entries = scan_recorded_paths()
+        paths = [path for path, _ in entries]
         
         if not paths:
             print("Nenhum caminho gravado encontrado.")
         else:
-            for i, path_file in enumerate(paths, 1):
+            for i, (path_file, stat) in enumerate(entries, 1):
                 print(f"{i}. {os.path.basename(path_file)}")
                 
                 try:
-                    with open(path_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
+                    data = load_path(path_file)
                     
-                    moves = len([a for a in data if a.get('type') == 'move'])
-                    clicks = len([a for a in data if a.get('type') == 'click'])
-                    waits = len([a for a in data if a.get('type') == 'wait'])
+                    # Uma única passada, sem listas intermediárias
+                    counts = Counter(a.get('type') for a in data)
+                    moves, clicks, waits = counts['move'], counts['click'], counts['wait']
                     
-                    file_size = round(os.path.getsize(path_file) / 1024, 2)
-                    mod_time = datetime.fromtimestamp(os.path.getmtime(path_file))
+                    # Num caminho binário o .json é só o cabeçalho; o tamanho
+                    # relevante é o das colunas no .bin
+                    bin_path = binary_data_file(path_file)
+                    size = os.path.getsize(bin_path) if bin_path else stat.st_size
+                    file_size = round(size / 1024, 2)
+                    mod_time = datetime.fromtimestamp(stat.st_mtime)
                     
                     print(f"   - Tamanho: {file_size} KB")
                     print(f"   - Modificado: {mod_time.strftime('%Y-%m-%d %H:%M:%S')}")
@@ -307,14 +376,8 @@ def configure_coordinates():
         
         try:
             # Executar mostrando a saída em tempo real
-            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, 
-                                     universal_newlines=True, bufsize=1)
-            
-            # Mostrar saída linha por linha
-            for line in process.stdout:
-                print(line, end='')
-                
-            process.wait()
+            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, env=_CHILD_ENV)
+            _pipe_to_stdout(process)
             print("\n🔄 Configuração finalizada, retornando ao menu...")
             time.sleep(1)
         except KeyboardInterrupt:
@@ -5,16 +5,27 @@ Sistema focado APENAS em reprodução de caminhos.
 TODAS as decisões de navegação são delegadas ao MovementManager.
 Mantém simplicidade máxima e responsabilidade única.
 """
+import atexit
 import json
+import logging
 import time
+from array import array
 import threading
 import keyboard
 import mouse
 import os
 import sys
-import glob
 from datetime import datetime
-from typing import Dict, List, Any
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+# orjson é opcional: quando disponível, acelera a leitura dos caminhos
+# e dos estados salvos
+try:
+    import orjson as _json_fast
+except ImportError:
+    _json_fast = None
 
 # Adicionar diretório principal ao PYTHONPATH
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -31,20 +42,71 @@ sys.path.insert(0, os.path.join(project_root, 'movement'))
 from config_utils import get_config
 from logging_utils import get_logger
 from memory_manager import get_memory_manager
-from movement_utils_simple import SimpleMovementManager as MovementManager, get_coordinates_from_memory
+from input_utils import send_click
+from path_codec import load_path
+from movement_utils_simple import SimpleMovementManager as MovementManager, Pos, get_coordinate_addrs, pos_to_dict, read_position
 
 # Definir tipos de ação (correspondendo aos do recorder)
 ACTION_MOVE = "move"
 ACTION_CLICK = "click"
 ACTION_WAIT = "wait"
 
+# Códigos compactos dos tipos de ação, usados no array de tipos do caminho
+# e como índice das contagens por tipo
+_T_MOVE, _T_CLICK, _T_WAIT, _T_UNKNOWN = 0, 1, 2, 3
+_TYPE_CODES = {ACTION_MOVE: _T_MOVE, ACTION_CLICK: _T_CLICK, ACTION_WAIT: _T_WAIT}
+
+# Marcador de Z ausente no array de coordenadas Z
+_Z_NONE = -2**31
+
+
+@lru_cache(maxsize=4)
+def _mm_connect(module_name: str):
+    """
+    Abre a conexão com o processo do jogo (guardada por _mm_cached).
+    
+    Args:
+        module_name: Nome do processo do jogo
+        
+    Returns:
+        Gerenciador de memória simples (conectado ou não)
+    """
+    mem = get_memory_manager(module_name, simple=True)
+    atexit.register(mem.cleanup)
+    return mem
+
+
+def _mm_cached(module_name: str):
+    """
+    Conexão com o processo do jogo compartilhada entre reproduções na mesma
+    sessão; o handle só é fechado quando o interpretador termina.
+    
+    Só uma conexão viva é reaproveitada: se a conexão guardada falhou ou o
+    jogo foi fechado/reiniciado, ela é descartada e uma nova é aberta.
+    
+    Args:
+        module_name: Nome do processo do jogo
+        
+    Returns:
+        Gerenciador de memória simples
+    """
+    mem = _mm_connect(module_name)
+    if mem.handle and mem.is_process_running():
+        return mem
+    
+    _mm_connect.cache_clear()
+    atexit.unregister(mem.cleanup)
+    mem.cleanup()
+    return _mm_connect(module_name)
+
 class PathPlayer:
     """
     Reproduz um caminho gravado, movendo o personagem automaticamente.
     Responsabilidade ÚNICA: reproduzir sequência de ações.
     TODAS as decisões de navegação são delegadas ao MovementManager.
     """
-    def __init__(self, config_path: str = "config/config.json", path_data: List[Dict[str, Any]] = None, path_file: str = None):
+    def __init__(self, config_path: str = "config/config.json", path_data: List[Dict[str, Any]] = None, path_file: str = None,
+                 interactive_hotkeys: Optional[bool] = None):
         """
         Inicializa o reprodutor de caminho.
         
@@ -52,13 +114,20 @@ class PathPlayer:
             config_path: Caminho para o arquivo de configuração
             path_data: Lista de ações do caminho a seguir
             path_file: Caminho para o arquivo de origem (para referência)
+            interactive_hotkeys: Registrar ESC/pausa e o prompt de estado salvo;
+                None usa "interactive_hotkeys" do config (padrão True)
         """
         self._stopped = False
         self._shutting_down = False
+        self._stop_event = threading.Event()  # Acorda esperas assim que parar
 
         # Configuração e logging
         self.config = get_config(config_path)
         self.logger = get_logger(__name__)
+        # Nível do logger avaliado uma vez: os logs por ação nem montam a
+        # mensagem quando INFO está desligado
+        self._log_info = self.logger.isEnabledFor(logging.INFO)
+        self._next_progress_index = 0  # Próximo índice a registrar progresso
         
         # Sistema V4: Identificação
         self.logger.info("🎯 Sistema V4: Reprodução Simples e Delegada ativado")
@@ -69,13 +138,27 @@ class PathPlayer:
         # Armazenar o arquivo de origem para referência
         self.path_file = path_file
         
+        # Última posição conhecida do personagem (lida no início e atualizada
+        # a cada movimento concluído)
+        self.current_pos: Optional[Pos] = None
+        
+        # Índice da próxima ação (atualizado ao carregar um estado salvo) e
+        # último arquivo de estado gravado
+        self.current_action_index = 0
+        self.saved_state_path: Optional[str] = None
+        
+        # Sequências de pelo menos tantos movimentos seguidos são entregues de
+        # uma vez ao MovementManager (move_to_many); 0 desativa
+        self._batch_size = self.config.get("move_batch_size", 8)
+        
         # Verificar se o caminho tem informações de tipo
         # Compatibilidade com caminhos antigos (somente movimentos)
         self._check_and_convert_path()
         
         # Inicializar gerenciador de memória
-        self.mem = get_memory_manager(self.config.get_module_name(), simple=True)
+        self.mem = _mm_cached(self.config.get_module_name())
         self.logger.info(f"Conectado ao processo {self.config.get_module_name()}")
+        self.coord_addrs = get_coordinate_addrs(self.config)
         
         # Inicializar gerenciador de movimento
         # Versão simplificada não precisa de use_axis_mapping
@@ -90,14 +173,56 @@ class PathPlayer:
         self.pause_event.set()  # Inicialmente não pausado
         self.pause_key = self.config.get_hotkey('pause_resume', 'F9')
         
+        # Hotkeys globais instalam um hook de teclado de baixo nível que
+        # acrescenta latência a toda tecla do sistema enquanto a reprodução
+        # roda; execuções sem supervisão podem dispensá-lo (sem ESC/pausa)
+        if interactive_hotkeys is None:
+            interactive_hotkeys = self.config.get("interactive_hotkeys", True)
+        self.interactive_hotkeys = interactive_hotkeys
+        
         # Configurações de playback
         self.normal_playback_delay = self.config.get("playback_delay", 0.2)
         
+        # Checkpoint periódico do progresso em segundo plano (0 desativa);
+        # o lock serializa as gravações de estado entre a thread e as pausas
+        self.checkpoint_interval = self.config.get("checkpoint_interval_s", 0)
+        self._state_lock = threading.Lock()
+        self._checkpoint_thread: Optional[threading.Thread] = None
+        
+        # Por padrão, só dois estados em disco (state_latest/state_previous);
+        # keep_history mantém um arquivo state_<timestamp>.json por pausa
+        self.keep_state_history = self.config.get("keep_history", False)
+        
+        # Pasta de estados resolvida e criada uma única vez
+        self._state_dir = Path("saved_states")
+        try:
+            self._state_dir.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            self.logger.error(f"Erro ao criar pasta '{self._state_dir}': {e}")
+            # Usar diretório atual como fallback
+            self._state_dir = Path(".")
+        
     def _check_and_convert_path(self):
         """
         Verifica se o caminho está no formato novo (com tipos de ação)
         e converte se necessário para compatibilidade.
         """
+        self._counts: List[int] = [0] * (_T_UNKNOWN + 1)  # Indexado pelo código do tipo
+        self._move_indices: List[int] = []
+        self._large_jumps = 0
+        self._jump_samples: List[tuple] = []  # Primeiros saltos: (dist, prev, curr)
+        
+        # Caminho em colunas (SoA) para o loop de execução: tipo e
+        # coordenadas por índice; cliques/esperas (raros) guardam a ação
+        # original num dicionário esparso
+        self._types = array('b')
+        self._xs = array('i')
+        self._ys = array('i')
+        self._zs = array('i')
+        self._params: Dict[int, Dict[str, Any]] = {}
+        self._move_runs: Dict[int, int] = {}  # Início → fim (exclusivo) das sequências de movimentos
+        self._path_len = len(self.path)
+        
         if not self.path:
             return
             
@@ -107,16 +232,62 @@ class PathPlayer:
         # Se não tiver, converter para formato com tipo "move"
         if not has_types:
             self.logger.info("Convertendo caminho antigo para novo formato (adicionando tipos de ação)")
-            converted_path = []
             
+            # Conversão no próprio caminho, sem montar uma segunda lista
             for point in self.path:
-                action = {'type': ACTION_MOVE}
-                action.update(point)  # Copiar x, y, z
-                converted_path.append(action)
-                
-            self.path = converted_path
+                if 'type' not in point:
+                    point['type'] = ACTION_MOVE
+                    
             self.logger.info(f"Conversão concluída: {len(self.path)} ações de movimento")
         
+        # Estatísticas e colunas (SoA) do caminho numa única passada,
+        # incluindo os saltos maiores que 1 SQM entre movimentos seguidos
+        counts = self._counts
+        move_indices = self._move_indices
+        jump_samples = self._jump_samples
+        types, xs, ys, zs, params = self._types, self._xs, self._ys, self._zs, self._params
+        large_jumps = 0
+        prev = None
+        for i, action in enumerate(self.path):
+            # O texto do tipo é consultado só aqui; dali em diante, o código
+            code = _TYPE_CODES.get(action.get('type'), _T_UNKNOWN)
+            counts[code] += 1
+            types.append(code)
+            if code != _T_MOVE:
+                xs.append(0)
+                ys.append(0)
+                zs.append(_Z_NONE)
+                params[i] = action
+            else:
+                xs.append(action['x'])
+                ys.append(action['y'])
+                z = action.get('z')  # Ausente ou null: sem Z
+                zs.append(_Z_NONE if z is None else z)
+                move_indices.append(i)
+                if prev is not None:
+                    dist = abs(action['x'] - prev['x']) + abs(action['y'] - prev['y'])
+                    if dist > 1:
+                        large_jumps += 1
+                        if large_jumps <= 3:  # Guardar apenas os primeiros 3
+                            jump_samples.append((dist, prev, action))
+                prev = action
+        self._large_jumps = large_jumps
+        
+        # Sequências de movimentos consecutivos longas o bastante para lote
+        batch_size = self._batch_size
+        if batch_size > 0:
+            run_start = None
+            for i, code in enumerate(types):
+                if code == _T_MOVE:
+                    if run_start is None:
+                        run_start = i
+                    continue
+                if run_start is not None and i - run_start >= batch_size:
+                    self._move_runs[run_start] = i
+                run_start = None
+            if run_start is not None and len(types) - run_start >= batch_size:
+                self._move_runs[run_start] = len(types)
+        
     def start(self) -> None:
         """
         Inicia a reprodução do caminho.
@@ -126,17 +297,13 @@ class PathPlayer:
             self.logger.warning("Caminho vazio ou com apenas um ponto. Nada a fazer.")
             return
             
-        # Contar tipos de ações para log
-        moves = sum(1 for item in self.path if item.get('type') == ACTION_MOVE)
-        clicks = sum(1 for item in self.path if item.get('type') == ACTION_CLICK)
-        waits = sum(1 for item in self.path if item.get('type') == ACTION_WAIT)
-        
-        # Inicializar o índice de ação atual (pode ser atualizado se carregar um estado salvo)
-        if not hasattr(self, 'current_action_index'):
-            self.current_action_index = 0
+        # Contagem de tipos de ações (calculada em _check_and_convert_path)
+        moves = self._counts[_T_MOVE]
+        clicks = self._counts[_T_CLICK]
+        waits = self._counts[_T_WAIT]
         
         # Verificar se tem um estado salvo para carregar
-        last_state = self._find_most_recent_state_file()
+        last_state = self._find_most_recent_state_file() if self.interactive_hotkeys else None
         try:
             if last_state:
                 # Perguntar se quer carregar o estado salvo
@@ -144,15 +311,14 @@ class PathPlayer:
                 print(f"Estado salvo encontrado: {os.path.basename(last_state)}")
                 print("Pressione 'S' para carregar este estado ou qualquer outra tecla para iniciar do zero.")
                 
-                # Esperar input por 5 segundos
-                start_time = time.time()
-                load_state = False
-                
-                while time.time() - start_time < 5:
-                    if keyboard.is_pressed('s'):
-                        load_state = True
-                        break
-                    time.sleep(0.1)
+                # Esperar input por até 5 segundos: o hook sinaliza o evento
+                # assim que 'S' é pressionado, sem polling
+                s_pressed = threading.Event()
+                hook = keyboard.on_press_key('s', lambda _: s_pressed.set())
+                try:
+                    load_state = s_pressed.wait(timeout=5.0)
+                finally:
+                    keyboard.unhook(hook)
                 
                 if load_state:
                     self._load_state_from_file(last_state)
@@ -174,26 +340,18 @@ class PathPlayer:
         
         # Mostrar primeiros e últimos pontos se houver movimentos
         if moves > 0:
-            first_move = next((a for a in self.path if a.get('type') == ACTION_MOVE), None)
-            last_move = next((a for a in reversed(self.path) if a.get('type') == ACTION_MOVE), None)
-            if first_move and last_move:
-                self.logger.info(f"Primeiro ponto: ({first_move['x']}, {first_move['y']})")
-                self.logger.info(f"Último ponto: ({last_move['x']}, {last_move['y']})")
+            first_move = self.path[self._move_indices[0]]
+            last_move = self.path[self._move_indices[-1]]
+            self.logger.info(f"Primeiro ponto: ({first_move['x']}, {first_move['y']})")
+            self.logger.info(f"Último ponto: ({last_move['x']}, {last_move['y']})")
                 
             # Verificar se o caminho tem movimentos de 1 SQM
             self.logger.info("")
             self.logger.info("Verificando integridade do caminho...")
-            large_jumps = 0
-            move_actions = [a for a in self.path if a.get('type') == ACTION_MOVE]
-            
-            for i in range(1, len(move_actions)):
-                prev = move_actions[i-1]
-                curr = move_actions[i]
-                dist = abs(curr['x'] - prev['x']) + abs(curr['y'] - prev['y'])
-                if dist > 1:
-                    large_jumps += 1
-                    if large_jumps <= 3:  # Mostrar apenas os primeiros 3
-                        self.logger.warning(f"  Salto de {dist} SQMs: ({prev['x']}, {prev['y']}) → ({curr['x']}, {curr['y']})")
+            large_jumps = self._large_jumps
+            
+            for dist, prev, curr in self._jump_samples:
+                self.logger.warning(f"  Salto de {dist} SQMs: ({prev['x']}, {prev['y']}) → ({curr['x']}, {curr['y']})")
             
             if large_jumps > 0:
                 self.logger.warning(f"⚠️ ATENÇÃO: Caminho contém {large_jumps} saltos maiores que 1 SQM!")
@@ -206,20 +364,29 @@ class PathPlayer:
         # Atualizar a posição atual
         try:
             # Obter coordenadas do personagem
-            self.current_pos = get_coordinates_from_memory(self.mem, self.config.config_path)
-            self.logger.info(f"Posição atual do personagem: ({self.current_pos['x']}, {self.current_pos['y']})")
+            self.current_pos = read_position(self.mem, *self.coord_addrs)
+            self.logger.info(f"Posição atual do personagem: ({self.current_pos.x}, {self.current_pos.y})")
         except Exception as e:
             self.logger.error(f"Falha ao ler posição inicial: {e}")
             self._shutdown()
             return
             
-        # Configurar hotkey para parar
-        keyboard.add_hotkey('esc', self.stop)
-        self.logger.info("Pressione ESC para cancelar a reprodução.")
+        if self.interactive_hotkeys:
+            # Configurar hotkey para parar
+            keyboard.add_hotkey('esc', self.stop)
+            self.logger.info("Pressione ESC para cancelar a reprodução.")
+            
+            # Configurar hotkey para pausar/retomar
+            keyboard.add_hotkey(self.pause_key, self.toggle_pause)
+            self.logger.info(f"Pressione {self.pause_key} para pausar/retomar a execução.")
+        else:
+            self.logger.info("Hotkeys desativadas: reprodução sem ESC/pausa (Ctrl+C no terminal para interromper).")
         
-        # Configurar hotkey para pausar/retomar
-        keyboard.add_hotkey(self.pause_key, self.toggle_pause)
-        self.logger.info(f"Pressione {self.pause_key} para pausar/retomar a execução.")
+        # Checkpoint periódico (independente das pausas)
+        if self.checkpoint_interval > 0:
+            self._checkpoint_thread = threading.Thread(target=self._checkpoint_loop, daemon=True)
+            self._checkpoint_thread.start()
+            self.logger.info(f"Checkpoint automático a cada {self.checkpoint_interval}s em {self._state_dir / 'state_latest.json'}")
         
         # Loop principal de reprodução
         self._execute_path()
@@ -250,45 +417,92 @@ class PathPlayer:
         Salva o estado atual do bot para um arquivo JSON na pasta 'saved_states'.
         """
         try:
-            # Criar pasta para estados se não existir
-            state_dir = "saved_states"
-            if not os.path.exists(state_dir):
-                try:
-                    os.makedirs(state_dir)
-                    self.logger.info(f"Pasta '{state_dir}' criada para armazenar estados")
-                except Exception as e:
-                    self.logger.error(f"Erro ao criar pasta '{state_dir}': {e}")
-                    # Usar diretório atual como fallback
-                    state_dir = "."
-            
-            # Gerar nome de arquivo com timestamp
+            state_dir = self._state_dir
+            
+            # Com histórico, um arquivo por pausa; sem ele, o estado anterior
+            # vira state_previous.json e o atual ocupa state_latest.json
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filepath = os.path.join(state_dir, f"state_{timestamp}.json")
-            
-            # Coletar estado atual
-            current_state = {
-                "timestamp": timestamp,
-                "current_position": self.current_pos,
-                "current_index": self.current_action_index if hasattr(self, 'current_action_index') else 0,
-                "path_length": len(self.path),
-                "config_path": self.config.config_path,
-                "path_file": self.path_file
-            }
-            
-            # Salvar estado para arquivo
-            with open(filepath, 'w') as f:
-                json.dump(current_state, f, indent=2)
+            if self.keep_state_history:
+                filepath = state_dir / f"state_{timestamp}.json"
+                previous = None
+            else:
+                filepath = state_dir / "state_latest.json"
+                previous = state_dir / "state_previous.json"
+            
+            # Coletar e salvar o estado atual
+            with self._state_lock:
+                self._write_state(filepath, self._collect_state(timestamp), previous)
                 
             # Armazenar caminho do arquivo para referência
-            self.saved_state_path = filepath
+            self.saved_state_path = str(filepath)
             
             self.logger.info(f"Estado salvo em {filepath}")
-            return filepath
+            return self.saved_state_path
             
         except Exception as e:
             self.logger.error(f"Erro ao salvar estado: {e}")
             return None
     
+    def _collect_state(self, timestamp: str) -> Dict[str, Any]:
+        """
+        Monta o dicionário com o estado atual da reprodução.
+        
+        Args:
+            timestamp: Momento do salvamento (formato %Y%m%d_%H%M%S)
+            
+        Returns:
+            Estado pronto para serializar
+        """
+        return {
+            "timestamp": timestamp,
+            "current_position": pos_to_dict(self.current_pos) if self.current_pos else None,
+            "current_index": self.current_action_index,
+            "path_length": len(self.path),
+            "config_path": self.config.config_path,
+            "path_file": self.path_file
+        }
+    
+    @staticmethod
+    def _write_state(filepath: Path, state: Dict[str, Any], rotate_to: Optional[Path] = None) -> None:
+        """
+        Grava o estado num arquivo temporário e o move sobre o destino, para
+        que uma interrupção nunca deixe um estado pela metade.
+        
+        Args:
+            filepath: Arquivo de destino
+            state: Estado a serializar
+            rotate_to: Se dado, o destino atual é movido para cá antes
+        """
+        if _json_fast:
+            data = _json_fast.dumps(state, option=_json_fast.OPT_INDENT_2)
+        else:
+            data = json.dumps(state, indent=2).encode('utf-8')
+        tmp_path = filepath.with_name(".state.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        if rotate_to:
+            try:
+                os.replace(filepath, rotate_to)
+            except FileNotFoundError:
+                pass
+        os.replace(tmp_path, filepath)
+    
+    def _checkpoint_loop(self) -> None:
+        """
+        Thread de checkpoint: a cada checkpoint_interval segundos grava o
+        progresso em saved_states/state_latest.json, até a reprodução parar.
+        """
+        filepath = self._state_dir / "state_latest.json"
+        interval = self.checkpoint_interval
+        while not self._stop_event.wait(interval):
+            try:
+                with self._state_lock:
+                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                    self._write_state(filepath, self._collect_state(timestamp))
+                self.logger.debug(f"Checkpoint salvo: índice {self.current_action_index}")
+            except Exception as e:
+                self.logger.error(f"Erro ao salvar checkpoint: {e}")
+    
     def _load_state_from_file(self, filepath: str = None) -> bool:
         """
         Carrega o estado do bot de um arquivo JSON.
@@ -301,7 +515,7 @@ class PathPlayer:
         """
         try:
             # Se não foi especificado, usar o último estado salvo
-            if not filepath and hasattr(self, 'saved_state_path'):
+            if not filepath and self.saved_state_path is not None:
                 filepath = self.saved_state_path
                 
             # Se ainda não foi definido, procurar na pasta de estados
@@ -310,21 +524,23 @@ class PathPlayer:
                 if filepath:
                     self.logger.info(f"Usando estado mais recente: {filepath}")
             
-            if not filepath or not os.path.exists(filepath):
+            # Carregar estado do arquivo (a própria abertura confirma que existe)
+            raw = None
+            if filepath:
+                try:
+                    with open(filepath, 'rb') as f:
+                        raw = f.read()
+                except FileNotFoundError:
+                    pass
+            if raw is None:
                 self.logger.warning("Arquivo de estado não encontrado!")
                 return False
-                
-            # Carregar estado do arquivo
-            with open(filepath, 'r') as f:
-                state = json.load(f)
+            state = _json_fast.loads(raw) if _json_fast else json.loads(raw)
                 
             # Restaurar valores
             if 'current_index' in state and state['current_index'] < len(self.path):
                 # Atualizar índice atual (começará a partir deste ponto)
-                if not hasattr(self, 'current_action_index'):
-                    self.current_action_index = state['current_index']
-                else:
-                    self.current_action_index = state['current_index']
+                self.current_action_index = state['current_index']
                 
             # Verificar se o caminho armazenado corresponde ao caminho atual
             if 'path_file' in state and state['path_file']:
@@ -347,17 +563,29 @@ class PathPlayer:
         Returns:
             Caminho para o arquivo mais recente ou None se não encontrar
         """
-        state_dir = "saved_states"
-        if not os.path.exists(state_dir):
-            return None
-            
-        state_files = glob.glob(os.path.join(state_dir, "state_*.json"))
-        if not state_files:
+        state_dir = self._state_dir
+        
+        # Sem histórico, o estado mais recente está sempre no mesmo arquivo
+        if not self.keep_state_history:
+            latest = state_dir / "state_latest.json"
+            return str(latest) if latest.exists() else None
+        
+        # Uma varredura só: o stat vem da própria entrada do diretório e
+        # basta guardar o mais recente (sem ordenar a lista)
+        best_path = None
+        best_mtime = -1.0
+        try:
+            with os.scandir(state_dir) as it:
+                for entry in it:
+                    name = entry.name
+                    if name.startswith("state_") and name.endswith(".json"):
+                        mtime = entry.stat().st_mtime
+                        if mtime > best_mtime:
+                            best_mtime, best_path = mtime, entry.path
+        except OSError:
             return None
             
-        # Ordenar por data de modificação (mais recente primeiro)
-        state_files.sort(key=lambda x: os.path.getmtime(x), reverse=True)
-        return state_files[0]
+        return best_path
 
     def _check_pause(self) -> None:
         """
@@ -374,68 +602,132 @@ class PathPlayer:
         TODAS as decisões de navegação são delegadas ao MovementManager.
         """
         # Usar o current_action_index para retomar de onde parou
-        i = self.current_action_index if hasattr(self, 'current_action_index') else 0
+        i = self.current_action_index
+        self._next_progress_index = 0
         self.logger.info(f"Iniciando execução do índice {i} de {len(self.path)}")
         
-        while i < len(self.path) and not self._stopped and not self._shutting_down:
+        # Tudo o que o loop consulta a cada ação fica em variáveis locais
+        types = self._types
+        params = self._params
+        runs = self._move_runs
+        n = len(self.path)
+        check_pause = self._check_pause
+        
+        # Despacho por código de tipo (array SoA), sem cadeia de if/elif
+        handlers = {
+            _T_MOVE: self._dispatch_move,
+            _T_CLICK: lambda idx: self._execute_click_action(params[idx]),
+            _T_WAIT: lambda idx: self._execute_wait_action(params[idx]),
+        }
+        dispatch_unknown = self._dispatch_unknown
+        
+        while i < n and not (self._stopped or self._shutting_down):
             # Verificar se está pausado
-            self._check_pause()
-            
-            # Obter a ação atual
-            action = self.path[i]
-            action_type = action.get('type', ACTION_MOVE)  # Compatibilidade com caminhos antigos
-            
-            # Executar a ação baseada no tipo
-            if action_type == ACTION_MOVE and not self._shutting_down:
-                success = self._execute_move_action(action, i)
-                if not success:
-                    self.logger.warning(f"❌ Movimento para {action} falhou. Pulando para próximo ponto...")
-                    # Continuar sem break - pular obstáculo
-                    
-            elif action_type == ACTION_CLICK and not self._shutting_down:
-                self._execute_click_action(action)
-                
-            elif action_type == ACTION_WAIT and not self._shutting_down:
-                self._execute_wait_action(action)
-                
-            else:
-                # Tipo de ação desconhecido - logar e pular
-                if not self._shutting_down:
-                    self.logger.warning(f"Tipo de ação desconhecido: {action_type}. Pulando.")
+            check_pause()
+            if self._shutting_down:
+                break
+            
+            # Sequência de movimentos: entregue inteira ao MovementManager
+            run_end = runs.get(i)
+            if run_end is not None:
+                i = self._execute_move_run(i, run_end)
+                continue
+            
+            handlers.get(types[i], dispatch_unknown)(i)
             
             # Avançar para a próxima ação
             i += 1
             self.current_action_index = i  # Atualizar índice para persistência
     
-    def _execute_move_action(self, action: Dict[str, Any], index: int) -> bool:
+    def _execute_move_run(self, start: int, end: int) -> int:
+        """
+        Executa os movimentos start..end-1 numa única chamada a
+        move_to_many, mantendo índice, posição, progresso e pausa em dia a
+        cada passo.
+        
+        Args:
+            start: Índice do primeiro movimento da sequência
+            end: Índice logo após o último movimento
+            
+        Returns:
+            Índice da próxima ação a executar
+        """
+        xs, ys, zs = self._xs, self._ys, self._zs
+        targets = [Pos(xs[j], ys[j], None if zs[j] == _Z_NONE else zs[j]) for j in range(start, end)]
+        log_progress = self._log_progress
+        
+        def on_step(k: int, ok: bool) -> bool:
+            index = start + k
+            if ok:
+                self.current_pos = targets[k]
+            else:
+                self._dispatch_failed_move(index)
+            self.current_action_index = index + 1
+            if k + 1 < len(targets):
+                log_progress(index + 1)
+            # Pausar entre passos como o loop principal faria
+            if self.paused:
+                self._check_pause()
+            return not self._shutting_down
+        
+        log_progress(start)
+        self.movement.move_to_many(targets, on_step)
+        return self.current_action_index
+    
+    def _log_progress(self, index: int) -> None:
+        """
+        Registra o progresso a cada 10 ações (formatado só se emitido).
+        
+        Um único limite é comparado por movimento; ao ser atingido, passa
+        para o início do próximo bloco de 10 ações.
+        """
+        if index >= self._next_progress_index:
+            self._next_progress_index = index - index % 10 + 10
+            if self._log_info:
+                total_actions = self._path_len
+                self.logger.info("[Progresso: %.0f%%] Executando ações %d-%d de %d",
+                                 index * 100 / total_actions, index + 1,
+                                 min(index + 10, total_actions), total_actions)
+    
+    def _dispatch_failed_move(self, index: int) -> None:
+        """Registra um movimento que falhou (o caminho segue adiante)."""
+        self.logger.warning(f"❌ Movimento para ({self._xs[index]}, {self._ys[index]}) falhou. Pulando para próximo ponto...")
+    
+    def _dispatch_move(self, index: int) -> None:
+        """Executa o movimento do índice dado, registrando falhas."""
+        if not self._execute_move_action(index):
+            # Continuar sem break - pular obstáculo
+            self._dispatch_failed_move(index)
+    
+    def _dispatch_unknown(self, index: int) -> None:
+        """Tipo de ação desconhecido - logar e pular."""
+        self.logger.warning(f"Tipo de ação desconhecido: {self._params[index].get('type')}. Pulando.")
+    
+    def _execute_move_action(self, index: int) -> bool:
         """
         Executa uma ação de movimento DELEGANDO ao MovementManager.
         
         Args:
-            action: Ação de movimento {x, y, [z], type}
-            index: Índice da ação no caminho
+            index: Índice da ação de movimento no caminho
             
         Returns:
             True se movimento foi bem-sucedido, False caso contrário
         """
-        target = {'x': action['x'], 'y': action['y']}
-        if 'z' in action:
-            target['z'] = action['z']
+        z = self._zs[index]
+        target = Pos(self._xs[index], self._ys[index], None if z == _Z_NONE else z)
         
-        # Log reduzido para melhor performance
-        if index % 10 == 0 or index == 0:  # Log a cada 10 ações
-            total_actions = len(self.path)
-            progress = (index / total_actions) * 100
-            self.logger.info(f"[Progresso: {progress:.0f}%] Executando ações {index+1}-{min(index+10, total_actions)} de {total_actions}")
+        # Log reduzido para melhor performance (a cada 10 ações)
+        self._log_progress(index)
         
         # Delegar ao MovementManager
         success = self.movement.move_to(target)
         
         if success:
             # Não precisamos de pausa extra aqui pois o MovementManager já adiciona
+            self.current_pos = target
             return True
         else:
-            self.logger.error(f"Falha ao executar movimento para ({target['x']}, {target['y']})")
+            self.logger.error(f"Falha ao executar movimento para ({target.x}, {target.y})")
             return False
     
     def _execute_click_action(self, action: Dict[str, Any]) -> None:
@@ -452,32 +744,50 @@ class PathPlayer:
         screen_y = action.get('screen_y', 0)
         button = action.get('button', 'left')
         
-        self.logger.info(f"Executando clique: botão {button} na posição ({screen_x}, {screen_y})")
+        if self._log_info:
+            self.logger.info("Executando clique: botão %s na posição (%s, %s)", button, screen_x, screen_y)
+        
+        if button not in ('left', 'right', 'middle'):
+            self.logger.warning(f"Botão de mouse desconhecido: {button}. Usando clique esquerdo.")
+            button = 'left'
         
         try:
-            # Mover o cursor para a posição
-            mouse.move(screen_x, screen_y)
-            
-            # Pequena pausa para garantir que o cursor chegou
-            time.sleep(0.1)
-            
-            # Executar o clique
-            if button == 'left':
-                mouse.click()
-            elif button == 'right':
-                mouse.right_click()
-            elif button == 'middle':
-                mouse.click(button='middle')
-            else:
-                self.logger.warning(f"Botão de mouse desconhecido: {button}. Usando clique esquerdo.")
-                mouse.click()
+            # Windows: movimento e clique num único lote de SendInput, sem
+            # a pausa entre eles; biblioteca mouse como alternativa
+            if not send_click(screen_x, screen_y, button):
+                self._click_with_mouse_lib(screen_x, screen_y, button)
                 
         except Exception as e:
             if not self._shutting_down:
                 self.logger.error(f"Erro ao executar clique de mouse: {e}")
         
         # Pausar após o clique para dar tempo de processamento ao jogo
-        time.sleep(self.mouse_click_delay)
+        # (relógio monotônico do Event, interrompida por stop()/_shutdown())
+        self._stop_event.wait(timeout=self.mouse_click_delay)
+    
+    @staticmethod
+    def _click_with_mouse_lib(screen_x: int, screen_y: int, button: str) -> None:
+        """
+        Clique pela biblioteca mouse (quando SendInput não está disponível).
+        
+        Args:
+            screen_x: Coordenada X da tela
+            screen_y: Coordenada Y da tela
+            button: 'left', 'right' ou 'middle'
+        """
+        # Mover o cursor para a posição
+        mouse.move(screen_x, screen_y)
+        
+        # Pequena pausa para garantir que o cursor chegou
+        time.sleep(0.1)
+        
+        # Executar o clique
+        if button == 'right':
+            mouse.right_click()
+        elif button == 'middle':
+            mouse.click(button='middle')
+        else:
+            mouse.click()
     
     def _execute_wait_action(self, action: Dict[str, Any]) -> None:
         """
@@ -487,12 +797,11 @@ class PathPlayer:
             action: Dicionário com informações da espera (seconds)
         """
         wait_seconds = action.get('seconds', 1.0)
-        self.logger.info(f"Executando espera de {wait_seconds:.1f} segundos")
+        if self._log_info:
+            self.logger.info("Executando espera de %.1f segundos", wait_seconds)
         
-        # Dividir a espera em intervalos menores para permitir interrupção
-        wait_start = time.time()
-        while time.time() - wait_start < wait_seconds and not self._stopped and not self._shutting_down:
-            time.sleep(min(0.5, wait_seconds))  # Intervalo máximo de 0.5s
+        # Uma única espera, interrompida imediatamente por stop()/_shutdown()
+        self._stop_event.wait(timeout=wait_seconds)
     
     def stop(self) -> None:
         """
@@ -500,6 +809,8 @@ class PathPlayer:
         """
         self._stopped = True
         self._shutting_down = True
+        self._stop_event.set()
+        self.pause_event.set()  # Não deixar o loop preso numa pausa
         self.logger.info("Parando reprodução...")
     
     def _shutdown(self) -> None:
@@ -512,6 +823,8 @@ class PathPlayer:
             
         self._shutting_down = True
         self._stopped = True
+        self._stop_event.set()
+        self.pause_event.set()
         
         try:
             # Dar um tempo para as threads perceberem as flags
@@ -520,9 +833,8 @@ class PathPlayer:
             # Remover hotkeys
             keyboard.unhook_all()
             
-            # Só fechar a conexão com o processo após todas as threads terem terminado
-            if hasattr(self, 'mem'):
-                self.mem.cleanup()
+            # A conexão com o processo é reaproveitada por outras reproduções
+            # e fechada no atexit (ver _mm_cached)
                 
         except Exception as e:
             self.logger.warning(f"Erro ao finalizar: {e}")
@@ -533,21 +845,24 @@ class PathPlayer:
         self.logger.info("RESUMO DA EXECUÇÃO")
         self.logger.info("="*60)
         
-        # Estatísticas de movimento se disponível
-        if hasattr(self, 'movement') and hasattr(self.movement, 'movement_count'):
-            self.logger.info(f"Total de movimentos executados: {self.movement.movement_count}")
+        # Estatísticas de movimento
+        self.logger.info(f"Total de movimentos executados: {self.movement.movement_count}")
             
-        # Posição final
-        try:
-            final_pos = get_coordinates_from_memory(self.mem, self.config.config_path)
-            self.logger.info(f"Posição final: ({final_pos['x']}, {final_pos['y']})")
-        except:
-            pass
+        # Posição final: o último alvo alcançado já é conhecido; só ler a
+        # memória se nenhum movimento chegou a ser feito
+        final_pos = self.current_pos
+        if final_pos is None:
+            try:
+                final_pos = read_position(self.mem, *self.coord_addrs)
+            except Exception:
+                final_pos = None
+        if final_pos is not None:
+            self.logger.info(f"Posição final: ({final_pos.x}, {final_pos.y})")
             
         # Status de conclusão
-        if hasattr(self, 'current_action_index'):
-            completion = (self.current_action_index / len(self.path)) * 100
-            self.logger.info(f"Progresso: {self.current_action_index}/{len(self.path)} ações ({completion:.1f}%)")
+        if self._path_len:
+            completion = (self.current_action_index / self._path_len) * 100
+            self.logger.info(f"Progresso: {self.current_action_index}/{self._path_len} ações ({completion:.1f}%)")
             
         self.logger.info("="*60)
         self.logger.info("Reprodução finalizada.")
@@ -565,6 +880,8 @@ def main() -> None:
     parser.add_argument('-c', '--config', default='config/config.json', help="Arquivo de configuração")
     parser.add_argument('-d', '--debug', action='store_true', help="Ativar modo de debug")
     parser.add_argument('--no-mouse', action='store_true', help="Ignorar eventos de mouse no caminho")
+    parser.add_argument('--no-hotkeys', action='store_true',
+                        help="Não registrar hotkeys globais (ESC/pausa); menor latência de teclado no sistema")
     args = parser.parse_args()
     
     try:
@@ -593,24 +910,25 @@ def main() -> None:
 
         # Carregar arquivo de caminho
         try:
-            with open(path_file, 'r') as f:
-                path_data = json.load(f)
-                logger.info(f"Carregado caminho com {len(path_data)} ações de {path_file}")
+            # JSON puro ou cabeçalho de caminho binário (ver path_codec)
+            path_data = load_path(path_file)
+            logger.info(f"Carregado caminho com {len(path_data)} ações de {path_file}")
+            
+            # Remover eventos de mouse se solicitado
+            if args.no_mouse:
+                path_data = [action for action in path_data if action.get('type') != ACTION_CLICK]
+                logger.info(f"Eventos de mouse ignorados. Caminho atualizado com {len(path_data)} ações.")
                 
-                # Remover eventos de mouse se solicitado
-                if args.no_mouse:
-                    path_data = [action for action in path_data if action.get('type') != ACTION_CLICK]
-                    logger.info(f"Eventos de mouse ignorados. Caminho atualizado com {len(path_data)} ações.")
-                    
-                # DEBUG: Imprimir as primeiras ações do caminho para verificação
-                if len(path_data) > 0:
-                    logger.debug(f"Primeiras ações: {path_data[0:3]}")
+            # DEBUG: Imprimir as primeiras ações do caminho para verificação
+            if len(path_data) > 0:
+                logger.debug(f"Primeiras ações: {path_data[0:3]}")
         except Exception as e:
             logger.error(f"Erro ao carregar arquivo de caminho: {e}")
             return 1
             
         # Iniciar reprodução
-        player = PathPlayer(args.config, path_data, path_file)
+        player = PathPlayer(args.config, path_data, path_file,
+                            interactive_hotkeys=False if args.no_hotkeys else None)
         player.start()
             
     except Exception as e:
@@ -3,14 +3,23 @@ Módulo de gravação de caminhos no jogo - Versão refatorada e aprimorada.
 Registra a sequência de posições do personagem e cliques de mouse para uso posterior.
 """
 import json
+import logging
 import time
 import threading
 import keyboard
 import os
 import sys
 import re
-from datetime import datetime
-from typing import Dict, List, Tuple, Optional, Set, Any, Union
+import queue
+from array import array
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Tuple, Optional, Set, Any, Union
+
+# orjson é opcional: quando disponível, acelera a serialização do caminho
+try:
+    import orjson as _json_fast
+except ImportError:
+    _json_fast = None
 
 # Adicionar diretório principal ao PYTHONPATH
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -27,29 +36,90 @@ sys.path.insert(0, os.path.join(project_root, 'movement'))
 from config_utils import get_config
 from logging_utils import get_logger
 from memory_manager import get_memory_manager
-from movement_utils_simple import get_coordinates_from_memory
+from movement_utils_simple import get_coordinate_addrs, make_position_reader
+from input_utils import CtrlAltHotkeys, get_cursor_pos
+from path_codec import write_binary_path
 
 # Definir novos tipos de evento
 ACTION_MOVE = "move"
 ACTION_CLICK = "click"
 
+# Códigos compactos dos tipos de evento, usados na coluna de tipos da gravação
+_T_MOVE, _T_CLICK = 0, 1
+
+# Marcador de Z ausente na coluna de coordenadas Z
+_Z_NONE = -2**31
+
+# Botões de clique: nos cliques a coluna Z guarda o índice do botão
+_BUTTONS = ("left", "right", "middle")
+_BUTTON_CODES = {button: code for code, button in enumerate(_BUTTONS)}
+
+# Capacidade inicial das colunas da gravação (dobrada quando enche)
+_INITIAL_CAPACITY = 4096
+
+# Intervalo mínimo entre atualizações da linha de progresso no console (10 Hz)
+_PRINT_INTERVAL_NS = 100_000_000
+
+
+# Codificador compacto de uma entrada do caminho (bytes UTF-8), criado uma vez
+if _json_fast:
+    _encode_entry = _json_fast.dumps
+else:
+    _encode_str = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False).encode
+    
+    def _encode_entry(entry: Dict[str, Any]) -> bytes:
+        return _encode_str(entry).encode('utf-8')
+
+
+def _write_file(filepath: str, data: bytes) -> None:
+    """
+    Grava o conteúdo inteiro com os.write direto no descritor (normalmente
+    uma única chamada; repete só se o sistema aceitar uma escrita parcial).
+    
+    Args:
+        filepath: Arquivo de destino (criado ou truncado)
+        data: Conteúdo completo
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+    fd = os.open(filepath, flags, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+# Posições empacotadas num único inteiro (comparação e hash baratos):
+# bits 0-19 = y, 20-39 = x (essa parte é a chave dos SQMs visitados),
+# 40-55 = z e o bit 56 marca Z ausente
+_NO_Z_KEY = 1 << 56
+
 # Configurar hotkeys para simular cliques do mouse
 # Como mouse.on_click() não está funcionando corretamente, usamos essa abordagem alternativa
 LEFT_CLICK_KEY = "ctrl+alt+1"   # Combinação para simular clique esquerdo
 RIGHT_CLICK_KEY = "ctrl+alt+2"  # Combinação para simular clique direito
 MIDDLE_CLICK_KEY = "ctrl+alt+3" # Combinação para simular clique do meio
 
+# Virtual-keys das mesmas combinações (tecla pressionada junto com Ctrl+Alt),
+# usadas pelo hook de teclado de baixo nível no Windows
+CLICK_KEY_VKS = {0x31: "left", 0x32: "right", 0x33: "middle"}
+
 class PathRecorder:
     """
     Grava o caminho percorrido pelo personagem no jogo e eventos de mouse.
     Implementação refatorada e aprimorada para suportar múltiplos tipos de eventos.
     """
-    def __init__(self, config_path: str = "config/config.json"):
+    def __init__(self, config_path: str = "config/config.json", binary: Optional[bool] = None,
+                 pretty: bool = False):
         """
         Inicializa o gravador de caminho.
         
         Args:
             config_path: Caminho para o arquivo de configuração
+            binary: Salvar no formato binário (cabeçalho .json + colunas em .bin);
+                None usa "record_binary" da configuração
+            pretty: Salvar o JSON indentado (legível, porém mais lento e maior)
         """
         # Configuração e logging
         self.config = get_config(config_path)
@@ -57,37 +127,84 @@ class PathRecorder:
         
         # Conectar ao processo
         self.memory = get_memory_manager(self.config.get_module_name(), simple=True)
-        self.logger.info(f"Conectado ao processo {self.config.get_module_name()}")
+        self.logger.info("Conectado ao processo %s", self.config.get_module_name())
         
         # Obter endereços diretos
-        pointer_chains = self.config.get_pointer_chains()
-        self.addr_x = pointer_chains['x']['base_offset']
-        self.addr_y = pointer_chains['y']['base_offset']
-        self.addr_z = pointer_chains['z']['base_offset']
+        self.addr_x, self.addr_y, self.addr_z = self.config.xyz_addrs
+        self.coord_addrs = get_coordinate_addrs(self.config)
+        # Leitor gerado para estes endereços: buffers e páginas resolvidos uma
+        # vez; devolve None quando os bytes lidos não mudaram desde a amostra anterior
+        self._read_xyz = make_position_reader(self.memory, *self.coord_addrs, changed_only=True)
         
-        self.logger.info(f"Usando endereços: X={hex(self.addr_x)}, Y={hex(self.addr_y)}, Z={hex(self.addr_z)}")
+        if self.addr_z is not None:
+            self.logger.info("Usando endereços: X=%#x, Y=%#x, Z=%#x", self.addr_x, self.addr_y, self.addr_z)
+        else:
+            self.logger.info("Usando endereços: X=%#x, Y=%#x (sem Z)", self.addr_x, self.addr_y)
         
         # Estado da gravação
         self.recording = False
-        self.path = []
-        self.last_pos = None
+        self._last_key = -1  # Posição empacotada da última amostra (-1: nenhuma)
         self.exit_flag = False
-        self.visited = set()
+        self._exit_event = threading.Event()  # Acorda o loop principal em stop()
+        self.visited: Set[int] = set()  # (x, y) empacotados dos SQMs visitados
+        
+        # Gravação em colunas (SoA) pré-alocadas: tipo, coordenadas e
+        # instante (ns desde o início da gravação) por índice, sem nenhum
+        # objeto por evento; cliques usam x/y para a posição na tela e z
+        # para o código do botão
+        self._types = array('B', bytes(_INITIAL_CAPACITY))
+        self._xs = array('i', bytes(4 * _INITIAL_CAPACITY))
+        self._ys = array('i', bytes(4 * _INITIAL_CAPACITY))
+        self._zs = array('i', bytes(4 * _INITIAL_CAPACITY))
+        self._ts = array('q', bytes(8 * _INITIAL_CAPACITY))
+        self._count = 0
+        self._click_count = 0
+        
+        # Referência de tempo da gravação: relógio de alta resolução para os
+        # deltas e horário de parede, convertido só ao salvar
+        self._t0_ns = time.perf_counter_ns()
+        self._t0_wall = datetime.now()
+        self._buf_lock = threading.Lock()  # Colunas compartilhadas entre o consumidor e toggle/salvamento
+        
+        # Eventos (tipo, x, y, z, instante) publicados pela leitura de posição e
+        # pelos cliques; a thread consumidora grava nas colunas, imprime e registra
+        self._events: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
         
         # Novo: Estado para gravação de mouse
         self.record_mouse = self.config.get("record_mouse", True)
         self.mouse_listener_active = False
+        self._click_hotkeys: Optional[CtrlAltHotkeys] = None  # Hook de baixo nível, se disponível
         self.min_mouse_interval = self.config.get("min_mouse_interval", 0.3)  # Mínimo intervalo entre cliques em segundos
-        self.last_mouse_time = 0
+        self._min_mouse_interval_ns = int(self.min_mouse_interval * 1_000_000_000)
+        self._last_mouse_ns = None
         
         # Intervalo de gravação
         self.record_interval = self.config.get("record_interval", 0.1)
+        
+        # Saída por evento: progresso no console (record_verbose) e log INFO,
+        # decidido uma vez para não formatar mensagens descartadas
+        self.verbose = self.config.get("record_verbose", True)
+        self._log_info = self.logger.isEnabledFor(logging.INFO)
+        
+        # Formato do arquivo salvo (ver path_codec)
+        self.record_binary = self.config.get("record_binary", False) if binary is None else binary
+        self.pretty = pretty
+        
+        # Debounce de movimentos (0 desativa): uma posição só é gravada depois de
+        # estável por record_debounce_ms ou quando o personagem muda de direção
+        self._debounce_ns = int(self.config.get("record_debounce_ms", 0) * 1_000_000)
+        self._pending: Optional[Tuple[int, int, Optional[int]]] = None  # Posição aguardando debounce
+        self._committed: Optional[Tuple[int, int, Optional[int]]] = None  # Última posição gravada
+        # Sinalizado pela thread de leitura ao ver recording=False: a partir
+        # daí ela não mexe mais em _pending e toggle() pode descarregá-lo
+        self._reader_idle = threading.Event()
     
     def start(self):
         """
         Inicia o gravador em uma thread separada e configura hotkeys.
         """
-        # Iniciar thread de monitoramento
+        # Iniciar threads de gravação (consumidor) e de monitoramento
+        threading.Thread(target=self._consumer_loop, daemon=True).start()
         threading.Thread(target=self._reader_loop, daemon=True).start()
         
         # Configurar teclas de atalho
@@ -96,16 +213,19 @@ class PathRecorder:
         keyboard.add_hotkey(start_stop_key, self.toggle)
         keyboard.add_hotkey(toggle_mouse_key, self.toggle_mouse_recording)
         keyboard.add_hotkey('esc', self.stop)
+        self._register_click_hotkeys()
         
         # Mensagem informativa atualizada para incluir mouse
-        self.logger.info(f"Pressione {start_stop_key} para iniciar/parar gravação, "
-                        f"{toggle_mouse_key} para ativar/desativar gravação de mouse, "
-                        f"ESC para sair.")
+        self.logger.info("Pressione %s para iniciar/parar gravação, "
+                         "%s para ativar/desativar gravação de mouse, "
+                         "ESC para sair.", start_stop_key, toggle_mouse_key)
         
         # Loop principal
         try:
-            while not self.exit_flag:
-                time.sleep(0.1)
+            # Dormir até stop(); o timeout só mantém Ctrl+C atendido no Windows,
+            # onde uma espera sem prazo não é interrompida pelo sinal
+            while not self._exit_event.wait(timeout=1.0):
+                pass
         except KeyboardInterrupt:
             self.logger.info("Interrupção recebida, finalizando...")
             self.stop()
@@ -117,9 +237,15 @@ class PathRecorder:
         Alterna entre iniciar e parar a gravação do caminho.
         """
         if not self.recording:
-            # Iniciar gravação
-            self.path.clear()
-            self.last_pos = None
+            # Iniciar gravação (as colunas são reaproveitadas, só o contador zera)
+            with self._buf_lock:
+                self._count = 0
+                self._click_count = 0
+                self._t0_ns = time.perf_counter_ns()
+                self._t0_wall = datetime.now()
+                self._pending = None
+                self._committed = None
+            self._last_key = -1
             self.visited.clear()
             self.recording = True
             
@@ -135,17 +261,27 @@ class PathRecorder:
                 print("Pressione F8 para parar a gravação quando terminar.")
         else:
             # Parar gravação
+            self._reader_idle.clear()
             self.recording = False
             
             # Parar monitoramento de mouse
             self._stop_mouse_monitoring()
             
+            # Esperar a leitura terminar a amostra em andamento (que ainda pode
+            # pôr uma posição em debounce), gravar a posição que aguardava o
+            # debounce e esperar o consumidor gravar todos os eventos publicados
+            if not self._reader_idle.wait(timeout=5.0):
+                self.logger.warning("Leitura de posição não respondeu; a última posição pode não ser gravada")
+            self._flush_pending()
+            self._drain_events()
+            
             # Salvar caminho
             filename = self._save_path()
-            moves = sum(1 for item in self.path if item.get('type') == ACTION_MOVE)
-            clicks = sum(1 for item in self.path if item.get('type') == ACTION_CLICK)
+            total = self._count
+            clicks = self._click_count
+            moves = total - clicks
             
-            print(f"\n[GRAVAÇÃO FINALIZADA] {len(self.path)} ações gravadas:")
+            print(f"\n[GRAVAÇÃO FINALIZADA] {total} ações gravadas:")
             print(f"- {moves} movimentos")
             print(f"- {clicks} cliques")
             print(f"- {len(self.visited)} SQMs únicos visitados")
@@ -153,8 +289,9 @@ class PathRecorder:
                 print(f"Caminho salvo em: {filename}")
             print()
             
-            self.logger.info(f"Gravação finalizada. {len(self.path)} ações no total: "
-                           f"{moves} movimentos, {clicks} cliques, {len(self.visited)} SQMs únicos.")
+            self.logger.info("Gravação finalizada. %d ações no total: "
+                             "%d movimentos, %d cliques, %d SQMs únicos.",
+                             total, moves, clicks, len(self.visited))
 
     def toggle_mouse_recording(self):
         """
@@ -174,7 +311,7 @@ class PathRecorder:
                 print("\n[ATENÇÃO] Gravação de mouse DESATIVADA. Apenas movimentos serão registrados.")
         else:
             msg = "ATIVADA" if self.record_mouse else "DESATIVADA"
-            self.logger.info(f"Gravação de mouse {msg} (será aplicada quando a gravação iniciar).")
+            self.logger.info("Gravação de mouse %s (será aplicada quando a gravação iniciar).", msg)
             print(f"\n[CONFIGURAÇÃO] Gravação de mouse {msg}.")
             print("Esta configuração será aplicada quando você iniciar a gravação.")
             
@@ -189,6 +326,8 @@ class PathRecorder:
         if self.recording:
             self.toggle()  # Para a gravação se estiver em andamento
         self.exit_flag = True
+        self._events.put(None)  # Encerra o consumidor
+        self._exit_event.set()
         self.logger.info("Finalizando programa.")
 
     def _cleanup(self):
@@ -201,8 +340,11 @@ class PathRecorder:
         except Exception as e:
             self.logger.warning(f"Erro ao remover hotkeys: {e}")
             
-        # Parar monitoramento de mouse
+        # Parar monitoramento de mouse e remover o hook dos atalhos de clique
         self._stop_mouse_monitoring()
+        if self._click_hotkeys is not None:
+            self._click_hotkeys.stop()
+            self._click_hotkeys = None
             
         # Fechar conexão com o processo
         if hasattr(self, 'memory'):
@@ -210,6 +352,64 @@ class PathRecorder:
             
         # Cleanup concluído
 
+    def _append(self, code: int, x: int, y: int, z: Optional[int],
+                now_ns: Optional[int] = None) -> int:
+        """
+        Grava um evento nas colunas, dobrando a capacidade quando cheias.
+        
+        Args:
+            code: Código do tipo (_T_MOVE ou _T_CLICK)
+            x: Coordenada X (ou X da tela, para cliques)
+            y: Coordenada Y (ou Y da tela, para cliques)
+            z: Coordenada Z ou None (código do botão, para cliques)
+            now_ns: Instante do evento (perf_counter_ns); None usa o atual
+            
+        Returns:
+            Total de eventos gravados após este
+        """
+        if now_ns is None:
+            now_ns = time.perf_counter_ns()
+        with self._buf_lock:
+            i = self._count
+            if code == _T_CLICK:
+                self._click_count += 1
+            if i == len(self._types):
+                for column in (self._types, self._xs, self._ys, self._zs, self._ts):
+                    column.extend(column)
+            self._types[i] = code
+            self._xs[i] = x
+            self._ys[i] = y
+            self._zs[i] = _Z_NONE if z is None else z
+            self._ts[i] = now_ns - self._t0_ns
+            self._count = i + 1
+        return i + 1
+    
+    def _iter_entries(self) -> Iterator[Dict[str, Any]]:
+        """
+        Reconstrói as entradas do caminho (formato do arquivo JSON) a partir
+        das colunas, uma por vez.
+        
+        Yields:
+            Dicionário de movimento ({type, x, y, [z]}) ou de clique
+        """
+        types, xs, ys, zs, ts = self._types, self._xs, self._ys, self._zs, self._ts
+        t0_wall = self._t0_wall
+        for i in range(self._count):
+            if types[i] == _T_CLICK:
+                # Horário ISO montado só agora, a partir do delta gravado
+                yield {
+                    'type': ACTION_CLICK,
+                    'screen_x': xs[i],
+                    'screen_y': ys[i],
+                    'button': _BUTTONS[zs[i]],
+                    'timestamp': (t0_wall + timedelta(microseconds=ts[i] // 1000)).isoformat()
+                }
+            else:
+                entry = {'type': ACTION_MOVE, 'x': xs[i], 'y': ys[i]}
+                if zs[i] != _Z_NONE:
+                    entry['z'] = zs[i]
+                yield entry
+    
     def _save_path(self):
         """
         Salva o caminho gravado em um arquivo JSON na pasta 'paths'.
@@ -217,7 +417,7 @@ class PathRecorder:
         Returns:
             str: Nome do arquivo salvo, ou None se falhou
         """
-        if not self.path:
+        if not self._count:
             self.logger.warning("Nenhum ponto gravado para salvar.")
             return None
             
@@ -226,7 +426,7 @@ class PathRecorder:
         if not os.path.exists(paths_dir):
             try:
                 os.makedirs(paths_dir)
-                self.logger.info(f"Pasta '{paths_dir}' criada para armazenar caminhos")
+                self.logger.info("Pasta '%s' criada para armazenar caminhos", paths_dir)
             except Exception as e:
                 self.logger.error(f"Erro ao criar pasta '{paths_dir}': {e}")
                 # Continuar e tentar salvar no diretório atual como fallback
@@ -268,9 +468,39 @@ class PathRecorder:
                 return None
         
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(self.path, f, indent=2, ensure_ascii=False)
-            self.logger.info(f"Caminho salvo em {filepath}")
+            if self.record_binary:
+                # Colunas gravadas como estão, com um cabeçalho JSON ao lado
+                columns = {"ts": self._ts, "x": self._xs, "y": self._ys, "z": self._zs, "type": self._types}
+                bin_path = write_binary_path(filepath, columns, self._count, self._t0_wall)
+                self.logger.info("Caminho salvo em %s (dados em %s)", filepath, bin_path)
+                print(f"[OK] Caminho salvo como: {filename}")
+                return filepath
+            
+            if self.pretty:
+                # Formato indentado, para inspeção manual de caminhos pequenos
+                entries = list(self._iter_entries())
+                if _json_fast:
+                    data = _json_fast.dumps(entries, option=_json_fast.OPT_INDENT_2)
+                else:
+                    data = json.dumps(entries, indent=2, ensure_ascii=False).encode('utf-8')
+                _write_file(filepath, data)
+                self.logger.info("Caminho salvo em %s", filepath)
+                print(f"[OK] Caminho salvo como: {filename}")
+                return filepath
+            
+            # Array JSON compacto montado entrada a entrada (uma por linha) num único
+            # buffer de bytes, sem a lista inteira de dicionários, e gravado
+            # no arquivo de uma vez
+            encode = _encode_entry
+            data = bytearray()
+            sep = b'[\n  '
+            for entry in self._iter_entries():
+                data += sep
+                data += encode(entry)
+                sep = b',\n  '
+            data += b'\n]\n'  # _count > 0: ao menos uma entrada foi escrita
+            _write_file(filepath, data)
+            self.logger.info("Caminho salvo em %s", filepath)
             print(f"[OK] Caminho salvo como: {filename}")
             return filepath
         except Exception as e:
@@ -278,44 +508,51 @@ class PathRecorder:
             print(f"[ERRO] Falha ao salvar em paths/: {e}")
             return None
 
-    def _start_mouse_monitoring(self):
+    def _register_click_hotkeys(self):
         """
-        Inicia o monitoramento de eventos de mouse usando teclas do teclado.
+        Registra uma única vez os atalhos de clique do mouse. Eles ficam ativos
+        durante todo o programa; _simulate_mouse_click ignora os disparos fora
+        de uma gravação com captura de mouse, então ligar e desligar a captura
+        não mexe nos atalhos.
         """
-        if not self.mouse_listener_active:
-            try:
-                # Configurar hotkeys para simular cliques
+        try:
+            # No Windows, um único hook de baixo nível compara virtual-keys;
+            # senão, pacote keyboard
+            hotkeys = CtrlAltHotkeys({
+                vk: (lambda b=button: self._simulate_mouse_click(b))
+                for vk, button in CLICK_KEY_VKS.items()
+            })
+            if hotkeys.start():
+                self._click_hotkeys = hotkeys
+            else:
                 keyboard.add_hotkey(LEFT_CLICK_KEY, lambda: self._simulate_mouse_click("left"))
                 keyboard.add_hotkey(RIGHT_CLICK_KEY, lambda: self._simulate_mouse_click("right"))
                 keyboard.add_hotkey(MIDDLE_CLICK_KEY, lambda: self._simulate_mouse_click("middle"))
-                
-                self.mouse_listener_active = True
-                self.logger.debug("Monitoramento de mouse iniciado via hotkeys.")
-                
-                # Mostrar instruções
-                print("\nComo usar cliques de mouse:")
-                print(f"  {LEFT_CLICK_KEY} - Registrar clique esquerdo")
-                print(f"  {RIGHT_CLICK_KEY} - Registrar clique direito")
-                print(f"  {MIDDLE_CLICK_KEY} - Registrar clique do meio")
-                print("Posicione o cursor onde deseja registrar o clique e pressione a combinação correspondente.")
-                
-            except Exception as e:
-                self.logger.error(f"Erro ao iniciar monitoramento de mouse: {e}")
-                self.mouse_listener_active = False
+            self.logger.debug("Atalhos de clique do mouse registrados.")
+        except Exception as e:
+            self.logger.error(f"Erro ao registrar atalhos de clique do mouse: {e}")
+
+    def _start_mouse_monitoring(self):
+        """
+        Inicia o monitoramento de eventos de mouse (os atalhos já estão
+        registrados; aqui só a captura é marcada como ativa).
+        """
+        if not self.mouse_listener_active:
+            self.mouse_listener_active = True
+            self.logger.debug("Monitoramento de mouse iniciado via hotkeys.")
+            
+            # Mostrar instruções
+            print("\nComo usar cliques de mouse:")
+            print(f"  {LEFT_CLICK_KEY} - Registrar clique esquerdo")
+            print(f"  {RIGHT_CLICK_KEY} - Registrar clique direito")
+            print(f"  {MIDDLE_CLICK_KEY} - Registrar clique do meio")
+            print("Posicione o cursor onde deseja registrar o clique e pressione a combinação correspondente.")
 
     def _stop_mouse_monitoring(self):
         """
         Para o monitoramento de eventos de mouse.
         """
         if self.mouse_listener_active:
-            try:
-                # Remover hotkeys específicas para mouse
-                keyboard.remove_hotkey(LEFT_CLICK_KEY)
-                keyboard.remove_hotkey(RIGHT_CLICK_KEY)
-                keyboard.remove_hotkey(MIDDLE_CLICK_KEY)
-            except Exception as e:
-                self.logger.warning(f"Erro ao remover hotkeys de mouse: {e}")
-            
             self.mouse_listener_active = False
             self.logger.debug("Monitoramento de mouse finalizado.")
 
@@ -330,9 +567,13 @@ class PathRecorder:
             return
             
         try:
-            # Obter a posição atual do cursor
-            import pyautogui
-            x, y = pyautogui.position()
+            # Obter a posição atual do cursor (GetCursorPos direto; pyautogui
+            # só onde a chamada do Windows não existe)
+            cursor = get_cursor_pos()
+            if cursor is None:
+                import pyautogui
+                cursor = pyautogui.position()
+            x, y = cursor
             
             # Registrar o clique
             self._on_mouse_click(x, y, button)
@@ -351,75 +592,203 @@ class PathRecorder:
             button: Botão pressionado ('left', 'right', 'middle')
         """
         # Verificar intervalo mínimo entre cliques para evitar duplicação
-        current_time = time.time()
-        if current_time - self.last_mouse_time < self.min_mouse_interval:
+        now_ns = time.perf_counter_ns()
+        last_ns = self._last_mouse_ns
+        if last_ns is not None and now_ns - last_ns < self._min_mouse_interval_ns:
             return
             
-        self.last_mouse_time = current_time
-        
-        # Criar entrada para o caminho
-        click_entry = {
-            'type': ACTION_CLICK,
-            'screen_x': x,
-            'screen_y': y,
-            'button': button,
-            'timestamp': datetime.now().isoformat()
-        }
-        
-        # Adicionar ao caminho e registrar
-        self.path.append(click_entry)
-        # Feedback visual para o usuário
-        print(f"\n[GRAVANDO] Clique {button} em ({x}, {y}) | Total: {len(self.path)} ações")
-        self.logger.info(f"Gravado clique: {button} em ({x}, {y})")
+        self._last_mouse_ns = now_ns
+        
+        # O movimento em debounce aconteceu antes do clique
+        self._flush_pending()
+        
+        # Publicar para o consumidor (botão como código em z; horário do clique)
+        self._events.put((_T_CLICK, x, y, _BUTTON_CODES.get(button, 0), now_ns))
 
+    def _commit_move(self, x: int, y: int, z: Optional[int]):
+        """
+        Publica um movimento para o consumidor e o marca como última posição gravada.
+        """
+        self._events.put((_T_MOVE, x, y, z, time.perf_counter_ns()))
+        self._committed = (x, y, z)
+    
+    def _flush_pending(self):
+        """
+        Grava a posição que aguarda o debounce, se houver.
+        """
+        with self._buf_lock:
+            self._flush_pending_locked()
+    
+    def _flush_pending_locked(self):
+        """
+        Como _flush_pending, para quem já tem _buf_lock.
+        """
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            self._commit_move(*pending)
+    
+    def _turns(self, pending: Tuple[int, int, Optional[int]], x: int, y: int, z: Optional[int]) -> bool:
+        """
+        Verifica se o passo até (x, y, z) muda a direção do trecho que leva
+        da última posição gravada até a posição em debounce.
+        """
+        committed = self._committed
+        if committed is None or z != pending[2]:
+            return True
+        cx, cy, _ = committed
+        px, py, _ = pending
+        return (((px > cx) - (px < cx)) != ((x > px) - (x < px))
+                or ((py > cy) - (py < cy)) != ((y > py) - (y < py)))
+    
+    def _defer_move(self, x: int, y: int, z: Optional[int]):
+        """
+        Coloca uma nova posição em debounce. A posição anterior em debounce é
+        gravada antes se o personagem mudou de direção; a primeira posição da
+        gravação é gravada na hora.
+        
+        Leitura e troca de _pending sob _buf_lock: cliques e toggle() também
+        descarregam a posição em debounce, de outras threads.
+        """
+        with self._buf_lock:
+            pending = self._pending
+            if pending is not None and self._turns(pending, x, y, z):
+                self._flush_pending_locked()
+            if self._committed is None:
+                self._commit_move(x, y, z)
+            else:
+                self._pending = (x, y, z)
+    
+    def _drain_events(self, timeout: float = 5.0):
+        """
+        Espera o consumidor gravar todos os eventos publicados até agora.
+        
+        Args:
+            timeout: Tempo máximo de espera em segundos
+        """
+        marker = threading.Event()
+        self._events.put(marker)
+        if not marker.wait(timeout):
+            self.logger.warning("Consumidor de eventos não respondeu; o caminho pode estar incompleto")
+    
+    def _consumer_loop(self):
+        """
+        Grava nas colunas os eventos publicados pela leitura de posição e pelos
+        cliques, atualiza os SQMs visitados e mostra o progresso. Assim print e
+        logging ficam fora da thread que amostra a posição.
+        """
+        get = self._events.get
+        append = self._append
+        visited_add = self.visited.add
+        log_info = self.logger.info
+        log_on = self._log_info
+        verbose = self.verbose
+        last_print_ns = time.perf_counter_ns() - _PRINT_INTERVAL_NS
+        while True:
+            event = get()
+            if event is None:
+                return
+            if isinstance(event, threading.Event):
+                # Marcador de _drain_events: tudo antes dele já foi gravado
+                event.set()
+                continue
+            
+            try:
+                code, x, y, z, now_ns = event
+                total = append(code, x, y, z, now_ns)
+                if code == _T_CLICK:
+                    button = _BUTTONS[z]
+                    if verbose:
+                        print(f"\n[GRAVANDO] Clique {button} em ({x}, {y}) | Total: {total} ações")
+                    if log_on:
+                        log_info("Gravado clique: %s em (%d, %d)", button, x, y)
+                    continue
+                
+                visited_add(((x & 0xFFFFF) << 20) | (y & 0xFFFFF))
+                
+                # Feedback visual para o usuário, no máximo 10x por segundo
+                if verbose and now_ns - last_print_ns >= _PRINT_INTERVAL_NS:
+                    last_print_ns = now_ns
+                    print(f"\r[GRAVANDO] Posição: x={x}, y={y}" + (f", z={z}" if z is not None else "") + f" | Total: {total} ações", end="")
+                
+                if log_on:
+                    log_info("Gravado movimento: (%d, %d, %s) (Total: %d)", x, y, z, total)
+            except Exception as e:
+                self.logger.error("Erro ao gravar evento: %s", e)
+    
     def _reader_loop(self):
         """
         Loop principal que monitora a posição do personagem.
-        Usa get_coordinates_from_memory para obter posição atual
+        Usa o leitor gerado em __init__ (_read_xyz) para obter posição atual
         para ler coordenadas sem aplicar o mapeamento de eixos.
         Agora adiciona tipo de ação 'move' para diferenciar de cliques.
+        
+        As leituras seguem prazos fixos (em ns inteiros): o tempo gasto na
+        leitura e no registro não se soma ao intervalo entre amostras. Cada
+        nova posição só é publicada na fila de eventos (ver _consumer_loop).
+        
+        Com record_debounce_ms > 0, trechos em linha reta viram só os pontos
+        de virada e de parada (ver _defer_move).
         """
+        # Configuração e métodos usados a cada amostra, resolvidos uma vez
+        include_z = self.config.get("include_z", True)
+        read_xyz = self._read_xyz
+        put = self._events.put
+        sleep = time.sleep
+        debounce_ns = self._debounce_ns
+        pending_since_ns = 0
+        
+        perf_ns = time.perf_counter_ns
+        interval_ns = int(self.record_interval * 1_000_000_000)
+        next_tick = perf_ns()
+        reader_idle = self._reader_idle
         while not self.exit_flag:
+            if not self.recording:
+                # Handshake com toggle(): nenhuma amostra em andamento
+                reader_idle.set()
             try:
                 if self.recording:
                     # Ler coordenadas usando a função centralizada
                     try:
-                        # Obter coordenadas da memória
-                        position = get_coordinates_from_memory(self.memory, self.config.config_path)
-                        
-                        # Extrair valores
-                        x = position['x']
-                        y = position['y']
-                        z = position.get('z')  # Pode ser None se include_z for False
+                        # Obter coordenadas da memória (tupla; z é None se include_z
+                        # for False). None: bytes iguais aos da amostra anterior, sem
+                        # conversão nem comparação; no início da gravação, leitura forçada
+                        key = self._last_key
+                        xyz = read_xyz(key < 0)
+                        if xyz is not None:
+                            x, y, z = xyz
+                            if not include_z:
+                                z = None
+                            key = ((x & 0xFFFFF) << 20) | (y & 0xFFFFF) | (_NO_Z_KEY if z is None else (z & 0xFFFF) << 40)
                         
-                        # Se temos coordenadas válidas e a posição mudou
-                        include_z = self.config.get("include_z", True)
-                        pos_tuple = (x, y, z) if include_z else (x, y, None)
-                        pos_xy = (x, y)  # para o set de visitados
-                        
-                        if pos_tuple != self.last_pos:
-                            # Criar entrada para o caminho
-                            # Formato atualizado com tipo "move"
-                            entry = {'type': ACTION_MOVE, 'x': x, 'y': y}
-                            if include_z and z is not None:
-                                entry['z'] = z
-                                
-                            # Adicionar ao caminho e registrar
-                            self.path.append(entry)
-                            self.visited.add(pos_xy)
-                            self.last_pos = pos_tuple
-                            
-                            # Feedback visual para o usuário
-                            print(f"\r[GRAVANDO] Posição: x={x}, y={y}" + (f", z={z}" if z is not None else "") + f" | Total: {len(self.path)} ações", end="")
-                            
-                            self.logger.info(f"Gravado movimento: {entry} (Total: {len(self.path)})")
+                        # Se a posição mudou
+                        if key != self._last_key:
+                            self._last_key = key
+                            if debounce_ns:
+                                # Segurar a posição até ficar estável ou virar
+                                self._defer_move(x, y, z)
+                                pending_since_ns = perf_ns()
+                            else:
+                                # Publicar o movimento; gravação e feedback no consumidor
+                                put((_T_MOVE, x, y, z, perf_ns()))
+                        elif self._pending is not None and perf_ns() - pending_since_ns >= debounce_ns:
+                            # Posição estável pelo tempo de debounce
+                            self._flush_pending()
                     except Exception as e:
-                        self.logger.error(f"Erro ao ler posição: {e}")
+                        self.logger.error("Erro ao ler posição: %s", e)
             except Exception as e:
-                self.logger.error(f"Erro no loop de leitura: {e}")
+                self.logger.error("Erro no loop de leitura: %s", e)
                 
-            # Aguardar próxima leitura
-            time.sleep(self.record_interval)
+            # Aguardar até o prazo da próxima leitura
+            next_tick += interval_ns
+            delay = next_tick - perf_ns()
+            if delay > 0:
+                sleep(delay / 1_000_000_000)
+            else:
+                # Atrasado (ex.: sistema suspenso): retomar a cadência de agora
+                next_tick = perf_ns()
+        
+        # Encerrada: também não há mais amostra em andamento
+        reader_idle.set()
 
 
 def main():
@@ -430,6 +799,8 @@ def main():
     parser.add_argument('-c', '--config', default='config/config.json', help="Arquivo de configuração")
     parser.add_argument('-d', '--debug', action='store_true', help="Ativar modo de debug")
     parser.add_argument('--no-mouse', action='store_true', help="Desativar gravação de mouse")
+    parser.add_argument('--binary', action='store_true', help="Salvar o caminho no formato binário")
+    parser.add_argument('--pretty', action='store_true', help="Salvar o JSON indentado (para depuração)")
     args = parser.parse_args()
     
     try:
@@ -446,7 +817,7 @@ def main():
             config.save_config()
         
         # Iniciar gravador
-        recorder = PathRecorder(args.config)
+        recorder = PathRecorder(args.config, binary=True if args.binary else None, pretty=args.pretty)
         recorder.start()
     except Exception as e:
         logger = get_logger(__name__)
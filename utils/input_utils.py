@@ -0,0 +1,418 @@
+"""
+Módulo de utilitários para envio de entrada (teclado e mouse) via SendInput.
+Envia várias teclas numa única chamada ao Windows, usando scancodes para
+que jogos que leem o teclado via DirectInput também recebam os eventos.
+Também lê a posição do cursor direto do user32 e oferece atalhos
+Ctrl+Alt+<tecla> por meio de um único hook de teclado de baixo nível.
+"""
+import ctypes
+import threading
+from ctypes import wintypes
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+INPUT_MOUSE = 0
+INPUT_KEYBOARD = 1
+INPUT_HARDWARE = 2
+
+KEYEVENTF_KEYUP = 0x0002
+KEYEVENTF_SCANCODE = 0x0008
+
+MOUSEEVENTF_MOVE = 0x0001
+MOUSEEVENTF_VIRTUALDESK = 0x4000
+MOUSEEVENTF_ABSOLUTE = 0x8000
+
+# Flags (pressionar, soltar) por botão do mouse
+MOUSE_BUTTON_FLAGS = {
+    'left': (0x0002, 0x0004),
+    'right': (0x0008, 0x0010),
+    'middle': (0x0020, 0x0040),
+}
+
+# Hook de teclado de baixo nível
+WH_KEYBOARD_LL = 13
+HC_ACTION = 0
+WM_QUIT = 0x0012
+WM_KEYDOWN = 0x0100
+WM_KEYUP = 0x0101
+WM_SYSKEYDOWN = 0x0104
+WM_SYSKEYUP = 0x0105
+
+# Bits de modificador por virtual-key (esquerdo/direito/genérico)
+_MOD_CTRL = 1
+_MOD_ALT = 2
+_MODIFIER_VKS = {
+    0x11: _MOD_CTRL, 0xA2: _MOD_CTRL, 0xA3: _MOD_CTRL,  # VK_CONTROL, VK_LCONTROL, VK_RCONTROL
+    0x12: _MOD_ALT, 0xA4: _MOD_ALT, 0xA5: _MOD_ALT,     # VK_MENU, VK_LMENU, VK_RMENU
+}
+
+# Índices de GetSystemMetrics para a área de trabalho virtual (todos os monitores)
+SM_XVIRTUALSCREEN = 76
+SM_YVIRTUALSCREEN = 77
+SM_CXVIRTUALSCREEN = 78
+SM_CYVIRTUALSCREEN = 79
+
+# Scancodes (set 1) das teclas de movimento
+SCANCODES = {
+    'w': 0x11,
+    'a': 0x1E,
+    's': 0x1F,
+    'd': 0x20,
+}
+
+ULONG_PTR = ctypes.c_size_t
+
+
+class MOUSEINPUT(ctypes.Structure):
+    _fields_ = [
+        ("dx", wintypes.LONG),
+        ("dy", wintypes.LONG),
+        ("mouseData", wintypes.DWORD),
+        ("dwFlags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", ULONG_PTR),
+    ]
+
+
+class KEYBDINPUT(ctypes.Structure):
+    _fields_ = [
+        ("wVk", wintypes.WORD),
+        ("wScan", wintypes.WORD),
+        ("dwFlags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", ULONG_PTR),
+    ]
+
+
+class HARDWAREINPUT(ctypes.Structure):
+    _fields_ = [
+        ("uMsg", wintypes.DWORD),
+        ("wParamL", wintypes.WORD),
+        ("wParamH", wintypes.WORD),
+    ]
+
+
+class _INPUTUNION(ctypes.Union):
+    # Todos os membros presentes para que sizeof(INPUT) bata com o do Windows
+    _fields_ = [
+        ("mi", MOUSEINPUT),
+        ("ki", KEYBDINPUT),
+        ("hi", HARDWAREINPUT),
+    ]
+
+
+class INPUT(ctypes.Structure):
+    _anonymous_ = ("u",)
+    _fields_ = [
+        ("type", wintypes.DWORD),
+        ("u", _INPUTUNION),
+    ]
+
+
+class KBDLLHOOKSTRUCT(ctypes.Structure):
+    _fields_ = [
+        ("vkCode", wintypes.DWORD),
+        ("scanCode", wintypes.DWORD),
+        ("flags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", ULONG_PTR),
+    ]
+
+
+# Protótipo do callback do hook (só existe no Windows)
+_WINFUNCTYPE = getattr(ctypes, 'WINFUNCTYPE', None)
+_HOOKPROC = _WINFUNCTYPE(wintypes.LPARAM, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM) if _WINFUNCTYPE else None
+
+
+_INPUT_SIZE = ctypes.sizeof(INPUT)
+
+_user32 = None
+_send_input = None
+_get_cursor_pos = None
+_cursor_point = wintypes.POINT()  # Reaproveitado a cada leitura do cursor
+
+
+def _get_user32():
+    """
+    Carrega user32.dll uma única vez (ou None fora do Windows).
+    """
+    global _user32
+    if _user32 is None:
+        windll = getattr(ctypes, 'WinDLL', None)
+        _user32 = windll('user32', use_last_error=True) if windll else False
+    return _user32 or None
+
+
+def _get_send_input():
+    """
+    Obtém user32.SendInput já com protótipo declarado (ou None fora do Windows).
+    """
+    global _send_input
+    if _send_input is None:
+        user32 = _get_user32()
+        if user32 is None:
+            _send_input = False
+        else:
+            func = user32.SendInput
+            func.argtypes = [wintypes.UINT, ctypes.c_void_p, ctypes.c_int]
+            func.restype = wintypes.UINT
+            _send_input = func
+    return _send_input or None
+
+
+_hook_api = None
+
+
+def _get_hook_api():
+    """
+    Obtém (uma única vez) as funções do user32/kernel32 usadas pelo hook de
+    teclado, já com protótipos declarados (ou None fora do Windows).
+    """
+    global _hook_api
+    if _hook_api is None:
+        user32 = _get_user32()
+        if user32 is None or _HOOKPROC is None:
+            _hook_api = False
+        else:
+            kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+            api = {
+                'SetWindowsHookExW': (user32.SetWindowsHookExW,
+                                      [ctypes.c_int, _HOOKPROC, wintypes.HINSTANCE, wintypes.DWORD], ctypes.c_void_p),
+                'UnhookWindowsHookEx': (user32.UnhookWindowsHookEx, [ctypes.c_void_p], wintypes.BOOL),
+                'CallNextHookEx': (user32.CallNextHookEx,
+                                   [ctypes.c_void_p, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM], wintypes.LPARAM),
+                'GetMessageW': (user32.GetMessageW,
+                                [ctypes.POINTER(wintypes.MSG), wintypes.HWND, wintypes.UINT, wintypes.UINT], wintypes.BOOL),
+                'PostThreadMessageW': (user32.PostThreadMessageW,
+                                       [wintypes.DWORD, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM], wintypes.BOOL),
+                'GetModuleHandleW': (kernel32.GetModuleHandleW, [wintypes.LPCWSTR], wintypes.HMODULE),
+                'GetCurrentThreadId': (kernel32.GetCurrentThreadId, [], wintypes.DWORD),
+            }
+            for func, argtypes, restype in api.values():
+                func.argtypes = argtypes
+                func.restype = restype
+            _hook_api = {name: spec[0] for name, spec in api.items()}
+    return _hook_api or None
+
+
+def _get_cursor_pos_func():
+    """
+    Obtém user32.GetCursorPos já com protótipo declarado (ou None fora do Windows).
+    """
+    global _get_cursor_pos
+    if _get_cursor_pos is None:
+        user32 = _get_user32()
+        if user32 is None:
+            _get_cursor_pos = False
+        else:
+            func = user32.GetCursorPos
+            func.argtypes = [ctypes.POINTER(wintypes.POINT)]
+            func.restype = wintypes.BOOL
+            _get_cursor_pos = func
+    return _get_cursor_pos or None
+
+
+def is_available() -> bool:
+    """
+    Indica se SendInput pode ser usado neste sistema.
+    """
+    return _get_send_input() is not None
+
+
+@lru_cache(maxsize=64)
+def _key_batch(keys: Tuple[str, ...], release: bool) -> Tuple[ctypes.Array, int]:
+    """
+    Monta (uma única vez por combinação) o array de INPUT que pressiona ou
+    solta todas as teclas dadas.
+    
+    Args:
+        keys: Teclas presentes em SCANCODES
+        release: True para soltar, False para pressionar
+    
+    Returns:
+        Tupla (array de INPUT, quantidade de eventos)
+    """
+    flags = KEYEVENTF_SCANCODE | (KEYEVENTF_KEYUP if release else 0)
+    batch = (INPUT * len(keys))()
+    for item, key in zip(batch, keys):
+        item.type = INPUT_KEYBOARD
+        item.ki.wScan = SCANCODES[key]
+        item.ki.dwFlags = flags
+    return batch, len(keys)
+
+
+def send_keys(keys: Sequence[str], release: bool = False) -> bool:
+    """
+    Pressiona (ou solta) todas as teclas numa única chamada a SendInput.
+    
+    Args:
+        keys: Tupla de teclas de movimento (w, a, s, d)
+        release: True para soltar as teclas
+    
+    Returns:
+        True se todos os eventos foram injetados; False se SendInput não
+        está disponível, a tecla não tem scancode ou o Windows recusou
+    """
+    send_input = _get_send_input()
+    if send_input is None or not keys:
+        return False
+    try:
+        batch, count = _key_batch(tuple(keys), release)
+    except KeyError:
+        return False
+    return send_input(count, batch, _INPUT_SIZE) == count
+
+
+def send_click(x: int, y: int, button: str = 'left') -> bool:
+    """
+    Move o cursor até (x, y) e clica, tudo numa única chamada a SendInput.
+    O Windows entrega os eventos em sequência na fila de entrada, sem
+    precisar de pausa entre o movimento e o clique.
+    
+    Args:
+        x: Coordenada X da tela (área de trabalho virtual)
+        y: Coordenada Y da tela (área de trabalho virtual)
+        button: 'left', 'right' ou 'middle'
+    
+    Returns:
+        True se todos os eventos foram injetados; False se SendInput não
+        está disponível, o botão é desconhecido ou o Windows recusou
+    """
+    send_input = _get_send_input()
+    if send_input is None or button not in MOUSE_BUTTON_FLAGS:
+        return False
+    
+    # Coordenadas absolutas são normalizadas para 0..65535 sobre a área virtual
+    metrics = _get_user32().GetSystemMetrics
+    left, top = metrics(SM_XVIRTUALSCREEN), metrics(SM_YVIRTUALSCREEN)
+    width, height = metrics(SM_CXVIRTUALSCREEN), metrics(SM_CYVIRTUALSCREEN)
+    if width <= 1 or height <= 1:
+        return False
+    
+    down, up = MOUSE_BUTTON_FLAGS[button]
+    batch = (INPUT * 3)()
+    for item in batch:
+        item.type = INPUT_MOUSE
+    move = batch[0].mi
+    move.dx = ((x - left) * 65535) // (width - 1)
+    move.dy = ((y - top) * 65535) // (height - 1)
+    move.dwFlags = MOUSEEVENTF_MOVE | MOUSEEVENTF_ABSOLUTE | MOUSEEVENTF_VIRTUALDESK
+    batch[1].mi.dwFlags = down
+    batch[2].mi.dwFlags = up
+    return send_input(3, batch, _INPUT_SIZE) == 3
+
+
+def get_cursor_pos() -> Optional[Tuple[int, int]]:
+    """
+    Lê a posição atual do cursor (coordenadas da tela) com GetCursorPos.
+    
+    Returns:
+        Tupla (x, y), ou None se a chamada não está disponível ou falhou
+    """
+    func = _get_cursor_pos_func()
+    if func is None:
+        return None
+    point = _cursor_point
+    if not func(ctypes.byref(point)):
+        return None
+    return point.x, point.y
+
+
+class CtrlAltHotkeys:
+    """
+    Atalhos Ctrl+Alt+<tecla> tratados por um único hook de teclado de baixo
+    nível (WH_KEYBOARD_LL). Cada tecla é uma comparação de inteiros no
+    callback; o estado de Ctrl/Alt vem dos próprios eventos do hook.
+    O hook e seu loop de mensagens rodam numa thread própria.
+    """
+    def __init__(self, handlers: Dict[int, Callable[[], None]]):
+        """
+        Args:
+            handlers: Virtual-key da tecla (ex.: 0x31 para '1') → função a
+                chamar quando pressionada com Ctrl+Alt
+        """
+        self._handlers = dict(handlers)
+        self._mods = 0
+        self._proc = None  # Referência ao callback (não pode ser coletado)
+        self._thread: Optional[threading.Thread] = None
+        self._thread_id = 0
+        self._ready = threading.Event()
+        self._installed = False
+    
+    @staticmethod
+    def is_available() -> bool:
+        """
+        Indica se o hook de baixo nível pode ser instalado neste sistema.
+        """
+        return _get_hook_api() is not None
+    
+    def start(self) -> bool:
+        """
+        Instala o hook numa thread dedicada.
+        
+        Returns:
+            True se o hook foi instalado
+        """
+        if self._thread is not None:
+            return self._installed
+        if _get_hook_api() is None:
+            return False
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout=2.0)
+        if not self._installed:
+            self._thread = None
+        return self._installed
+    
+    def stop(self) -> None:
+        """
+        Remove o hook e encerra a thread do loop de mensagens.
+        """
+        thread = self._thread
+        if thread is None:
+            return
+        self._thread = None
+        api = _get_hook_api()
+        if api is not None and self._thread_id:
+            api['PostThreadMessageW'](self._thread_id, WM_QUIT, 0, 0)
+        thread.join(timeout=1.0)
+    
+    def _run(self) -> None:
+        """Thread do hook: instala, bombeia mensagens e remove ao sair."""
+        api = _get_hook_api()
+        self._thread_id = api['GetCurrentThreadId']()
+        self._mods = 0
+        self._proc = _HOOKPROC(self._callback)
+        hook = api['SetWindowsHookExW'](WH_KEYBOARD_LL, self._proc, api['GetModuleHandleW'](None), 0)
+        self._installed = bool(hook)
+        self._ready.set()
+        if not hook:
+            return
+        try:
+            # Hooks de baixo nível só são chamados enquanto esta thread
+            # processa mensagens; WM_QUIT (de stop) encerra o loop
+            msg = wintypes.MSG()
+            get_message = api['GetMessageW']
+            while get_message(ctypes.byref(msg), None, 0, 0) > 0:
+                pass
+        finally:
+            api['UnhookWindowsHookEx'](hook)
+            self._installed = False
+    
+    def _callback(self, n_code: int, w_param: int, l_param: int) -> int:
+        """Callback do hook: atualiza Ctrl/Alt e despacha as teclas registradas."""
+        if n_code == HC_ACTION:
+            vk = KBDLLHOOKSTRUCT.from_address(l_param).vkCode
+            mod = _MODIFIER_VKS.get(vk)
+            if w_param == WM_KEYDOWN or w_param == WM_SYSKEYDOWN:
+                if mod:
+                    self._mods |= mod
+                elif self._mods == _MOD_CTRL | _MOD_ALT:
+                    handler = self._handlers.get(vk)
+                    if handler is not None:
+                        # Nunca bloquear o hook: o Windows o descarta se demorar
+                        threading.Thread(target=handler, daemon=True).start()
+            elif mod and (w_param == WM_KEYUP or w_param == WM_SYSKEYUP):
+                self._mods &= ~mod
+        return _get_hook_api()['CallNextHookEx'](None, n_code, w_param, l_param)
@@ -2,13 +2,19 @@
 Módulo de utilitários para gerenciamento de logs do PokeTibia Bot.
 Centraliza a lógica de configuração e acesso aos logs.
 """
+import atexit
 import logging
 import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from typing import Dict, Any, Optional
 
 # Variável global para rastrear se o logging foi configurado
 _logging_configured = False
 
+# Thread que escreve os logs no arquivo (criada em setup_file_logging)
+_file_listener: Optional[QueueListener] = None
+
 def get_logger(name: str, level: int = None) -> logging.Logger:
     """
     Obtém um logger configurado.
@@ -44,7 +50,11 @@ def setup_file_logging(log_file: str = "poketibia_bot.log") -> None:
     Args:
         log_file: Caminho para o arquivo de log
     """
-    global _logging_configured
+    global _logging_configured, _file_listener
+    
+    # Reconfiguração: encerrar a thread de escrita anterior (descarrega a fila)
+    if _file_listener is not None:
+        _stop_file_listener()
     
     # Configurar o logger raiz
     root_logger = logging.getLogger()
@@ -69,7 +79,17 @@ def setup_file_logging(log_file: str = "poketibia_bot.log") -> None:
         file_handler = logging.FileHandler(log_file, mode='a', encoding='utf-8')
         file_handler.setFormatter(formatter)
         file_handler.setLevel(logging.DEBUG)  # Arquivo captura tudo
-        root_logger.addHandler(file_handler)
+        
+        # Quem loga só enfileira o registro; uma thread de fundo o grava no
+        # arquivo logo em seguida (sem buffer extra que se perca se o
+        # processo for encerrado à força)
+        log_queue = queue.Queue(-1)
+        queue_handler = QueueHandler(log_queue)
+        queue_handler.setLevel(logging.DEBUG)
+        root_logger.addHandler(queue_handler)
+        
+        _file_listener = QueueListener(log_queue, file_handler)
+        _file_listener.start()
     except Exception as e:
         print(f"Erro ao criar handler de arquivo: {e}")
     
@@ -81,6 +101,22 @@ def setup_file_logging(log_file: str = "poketibia_bot.log") -> None:
     
     _logging_configured = True
 
+def _stop_file_listener() -> None:
+    """
+    Encerra a thread de escrita do arquivo de log, gravando o que ainda
+    estiver na fila.
+    """
+    global _file_listener
+    listener = _file_listener
+    if listener is None:
+        return
+    _file_listener = None
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+atexit.register(_stop_file_listener)
+
 def set_log_level(level: int) -> None:
     """
     Define o nível de log para o logger raiz.
@@ -0,0 +1,358 @@
+"""
+Formato binário dos caminhos gravados.
+
+O arquivo .json do caminho passa a ser um cabeçalho pequeno que aponta para
+um .bin com as colunas da gravação (tipo, x, y, z e instante) gravadas como
+estão na memória do gravador (versão 1) ou com as coordenadas como diferenças
+entre entradas seguidas em varints zigzag (versão 2, o padrão: num caminho
+andado de SQM em SQM quase toda diferença cabe num byte). A leitura mapeia o
+.bin com mmap e lê as colunas cruas direto do mapeamento, sem interpretar JSON
+entrada a entrada.
+Caminhos em JSON puro (lista de ações) continuam sendo lidos normalmente.
+"""
+import json
+import mmap
+import os
+import re
+import sys
+from array import array
+from itertools import accumulate
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+# orjson é opcional: quando disponível, acelera a leitura dos caminhos JSON
+try:
+    import orjson as _json_fast
+except ImportError:
+    _json_fast = None
+
+# Identificação do cabeçalho de um caminho binário
+PATH_FORMAT = "poketibia-path-bin"
+_VERSION_RAW = 1
+_VERSION_DELTA = 2
+PATH_FORMAT_VERSION = _VERSION_DELTA  # Versão gravada por padrão (colunas em diferenças)
+
+# Mesmos códigos e marcadores das colunas do gravador
+_T_MOVE, _T_CLICK = 0, 1
+_Z_NONE = -2**31
+_BUTTONS = ("left", "right", "middle")
+
+# Colunas na ordem em que aparecem no .bin: as de 8 bytes primeiro, para que
+# todas fiquem alinhadas ao tamanho do próprio item no mapeamento
+_COLUMNS = (("ts", "q"), ("x", "i"), ("y", "i"), ("z", "i"), ("type", "B"))
+
+# Na versão 2, instantes e tipos em bytes crus (lidos sem cópia) seguidos das
+# coordenadas em diferenças; os instantes ficam crus porque suas diferenças
+# (~100 ms em ns) não cabem num byte e só deixariam a leitura mais lenta
+_DELTA_COLUMNS = ("x", "y", "z")
+
+# Decodificação em bloco: início de uma varint de vários bytes e valor
+# zigzag de cada varint de um byte
+_MULTI_BYTE_RE = re.compile(rb'[\x80-\xff]')
+_ZIGZAG_SMALL = tuple((u >> 1) if not u & 1 else -((u + 1) >> 1) for u in range(0x80))
+
+
+def _encode_deltas(column: array, count: int, out: bytearray) -> None:
+    """
+    Acrescenta a out as diferenças entre valores seguidos da coluna (o
+    primeiro relativo a 0), em zigzag (sinal no bit menos significativo)
+    e varint (7 bits por byte, bit alto indica continuação).
+    """
+    append = out.append
+    prev = 0
+    for i in range(count):
+        value = column[i]
+        delta = value - prev
+        prev = value
+        u = delta << 1 if delta >= 0 else ((-delta) << 1) - 1
+        while u > 0x7F:
+            append((u & 0x7F) | 0x80)
+            u >>= 7
+        append(u)
+
+
+def _decode_deltas(data: memoryview, pos: int, count: int, typecode: str) -> Tuple[array, int]:
+    """
+    Reconstrói uma coluna gravada por _encode_deltas (soma acumulada).
+    
+    Trechos de varints de um byte (diferenças pequenas, o caso comum) são
+    convertidos em bloco por tabela; só as varints de vários bytes passam
+    pelo laço byte a byte.
+    
+    Returns:
+        (coluna, posição logo após a última varint lida)
+    
+    Raises:
+        ValueError: Se os dados terminarem no meio da coluna ou um valor não
+            couber no tipo da coluna
+    """
+    search = _MULTI_BYTE_RE.search
+    small = _ZIGZAG_SMALL.__getitem__
+    end = len(data)
+    deltas: List[int] = []
+    extend = deltas.extend
+    remaining = count
+    append = deltas.append
+    while remaining:
+        if pos >= end:
+            raise ValueError(f"Dados em diferenças truncados (entrada {count - remaining} de {count})")
+        if data[pos] < 0x80:
+            # Varints de um byte até a próxima de vários bytes (ou o fim da coluna)
+            limit = min(end, pos + remaining)
+            match = search(data, pos, limit)
+            stop = match.start() if match else limit
+            extend(map(small, data[pos:stop]))
+            remaining -= stop - pos
+            pos = stop
+            continue
+        
+        # Uma varint de vários bytes
+        u = 0
+        shift = 0
+        while True:
+            if pos >= end:
+                raise ValueError(f"Dados em diferenças truncados (entrada {count - remaining} de {count})")
+            byte = data[pos]
+            pos += 1
+            u |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        append((u >> 1) if not u & 1 else -((u + 1) >> 1))
+        remaining -= 1
+    
+    try:
+        return array(typecode, accumulate(deltas)), pos
+    except OverflowError:
+        raise ValueError(f"Valor fora do intervalo da coluna '{typecode}' nos dados em diferenças") from None
+
+
+def write_binary_path(json_path: str, columns: Dict[str, array], count: int, t0_wall: datetime,
+                      delta: bool = PATH_FORMAT_VERSION == _VERSION_DELTA) -> str:
+    """
+    Grava as colunas no .bin e o cabeçalho JSON que aponta para ele.
+    
+    Args:
+        json_path: Caminho do cabeçalho (.json); o .bin fica ao lado, com o mesmo nome
+        columns: Colunas da gravação por nome ("ts", "x", "y", "z", "type")
+        count: Número de eventos válidos no início de cada coluna
+        t0_wall: Horário de início da gravação (os instantes são deltas em ns)
+        delta: Gravar as coordenadas em diferenças (versão 2); False grava
+            todas as colunas cruas (versão 1), lidas sem cópia pelo mapeamento.
+            O padrão segue PATH_FORMAT_VERSION
+    
+    Returns:
+        Caminho do arquivo .bin gravado
+    """
+    bin_path = os.path.splitext(json_path)[0] + ".bin"
+    for name, typecode in _COLUMNS:
+        if columns[name].typecode != typecode:
+            raise ValueError(f"Coluna '{name}' com tipo '{columns[name].typecode}', esperado '{typecode}'")
+    
+    data = bytearray()
+    if delta:
+        data += memoryview(columns["ts"])[:count]
+        data += memoryview(columns["type"])[:count]
+        for name in _DELTA_COLUMNS:
+            _encode_deltas(columns[name], count, data)
+    else:
+        for name, _ in _COLUMNS:
+            data += memoryview(columns[name])[:count]
+    
+    with open(bin_path, 'wb') as f:
+        f.write(data)
+    
+    # Cabeçalho gravado por último: nunca aponta para um .bin incompleto
+    header = {
+        "format": PATH_FORMAT,
+        "version": _VERSION_DELTA if delta else _VERSION_RAW,
+        "data": os.path.basename(bin_path),
+        "count": count,
+        "byteorder": sys.byteorder,
+        "columns": [[name, typecode, array(typecode).itemsize] for name, typecode in _COLUMNS],
+        "t0": t0_wall.isoformat(),
+    }
+    if delta:
+        header["encoding"] = "zigzag-varint-delta"
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(header, f, indent=2)
+    
+    return bin_path
+
+
+def is_binary_header(data: Any) -> bool:
+    """Indica se o conteúdo de um .json é o cabeçalho de um caminho binário."""
+    return isinstance(data, dict) and data.get("format") == PATH_FORMAT
+
+
+def _build_actions(count: int, columns: Dict[str, Any], t0_wall: datetime) -> List[Dict[str, Any]]:
+    """
+    Monta as ações (formato do JSON) a partir das colunas indexáveis.
+    
+    Args:
+        count: Número de eventos
+        columns: Colunas por nome ("ts", "x", "y", "z", "type")
+        t0_wall: Horário de início da gravação
+    
+    Returns:
+        Lista de ações no mesmo formato do JSON
+    
+    Raises:
+        ValueError: Se um clique tiver código de botão inválido
+    """
+    ts, xs, ys, zs, types = columns["ts"], columns["x"], columns["y"], columns["z"], columns["type"]
+    actions: List[Dict[str, Any]] = []
+    append = actions.append
+    for i in range(count):
+        if types[i] == _T_CLICK:
+            button = zs[i]
+            if not 0 <= button < len(_BUTTONS):
+                raise ValueError(f"Código de botão inválido na entrada {i}: {button}")
+            append({
+                'type': "click",
+                'screen_x': xs[i],
+                'screen_y': ys[i],
+                'button': _BUTTONS[button],
+                'timestamp': (t0_wall + timedelta(microseconds=ts[i] // 1000)).isoformat()
+            })
+        else:
+            z = zs[i]
+            action = {'type': "move", 'x': xs[i], 'y': ys[i]}
+            if z != _Z_NONE:
+                action['z'] = z
+            append(action)
+    return actions
+
+
+def _read_columns(bin_path: str, header: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Mapeia o .bin e monta as ações a partir das colunas.
+    
+    Args:
+        bin_path: Arquivo de dados
+        header: Cabeçalho já validado
+    
+    Returns:
+        Lista de ações no mesmo formato do JSON
+    """
+    count = header["count"]
+    if not count:
+        return []
+    if header.get("byteorder", sys.byteorder) != sys.byteorder:
+        raise ValueError("Caminho binário gravado com outra ordem de bytes")
+    
+    delta = header["version"] == _VERSION_DELTA
+    layout = [(name, typecode, count * array(typecode).itemsize) for name, typecode in _COLUMNS]
+    expected = sum(size for _, _, size in layout)
+    t0_wall = datetime.fromisoformat(header["t0"])
+    
+    with open(bin_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if not delta and len(mm) != expected:
+            raise ValueError(f"Tamanho de {bin_path} ({len(mm)} bytes) não confere com o cabeçalho ({expected})")
+        
+        whole = memoryview(mm)
+        views: Dict[str, Any] = {}
+        try:
+            if delta:
+                # Instantes e tipos crus, depois cada coordenada reconstruída
+                # das diferenças
+                pos = 9 * count
+                if len(mm) < pos:
+                    raise ValueError(f"Tamanho de {bin_path} ({len(mm)} bytes) menor que o das colunas cruas ({pos})")
+                views["ts"] = whole[:8 * count].cast("q")
+                views["type"] = whole[8 * count:pos]
+                typecodes = dict(_COLUMNS)
+                for name in _DELTA_COLUMNS:
+                    views[name], pos = _decode_deltas(whole, pos, count, typecodes[name])
+                if pos != len(mm):
+                    raise ValueError(f"Tamanho de {bin_path} ({len(mm)} bytes) não confere com o cabeçalho ({pos})")
+            else:
+                # Visões tipadas direto sobre o mapeamento (sem cópia)
+                offset = 0
+                for name, typecode, size in layout:
+                    views[name] = whole[offset:offset + size].cast(typecode)
+                    offset += size
+            
+            return _build_actions(count, views, t0_wall)
+        finally:
+            # O mapeamento só fecha depois que nenhuma visão o referencia
+            for view in views.values():
+                if isinstance(view, memoryview):
+                    view.release()
+            whole.release()
+
+
+def _read_json(path_file: str) -> Any:
+    """Lê um .json de caminho (lista de ações ou cabeçalho binário)."""
+    with open(path_file, 'rb') as f:
+        raw = f.read()
+    return _json_fast.loads(raw) if _json_fast else json.loads(raw)
+
+
+def load_path(path_file: str) -> List[Dict[str, Any]]:
+    """
+    Carrega um caminho gravado, em JSON puro ou binário (cabeçalho + .bin).
+    
+    Args:
+        path_file: Arquivo .json do caminho
+    
+    Returns:
+        Lista de ações do caminho
+    
+    Raises:
+        ValueError: Se o cabeçalho ou o .bin forem inválidos
+    """
+    data = _read_json(path_file)
+    
+    if not is_binary_header(data):
+        return data
+    if data.get("version") not in (_VERSION_RAW, _VERSION_DELTA):
+        raise ValueError(f"Versão de caminho binário não suportada: {data.get('version')}")
+    
+    bin_path = os.path.join(os.path.dirname(path_file), data["data"])
+    return _read_columns(bin_path, data)
+
+
+def binary_data_file(path_file: str) -> Optional[str]:
+    """
+    Obtém o .bin de um caminho binário.
+    
+    Args:
+        path_file: Arquivo .json do caminho
+    
+    Returns:
+        Caminho do .bin, ou None se o caminho for JSON puro
+    """
+    # Só caminhos binários têm um .bin ao lado; sem ele, nem lê o .json
+    if not os.path.exists(os.path.splitext(path_file)[0] + ".bin"):
+        return None
+    data = _read_json(path_file)
+    if not is_binary_header(data):
+        return None
+    return os.path.join(os.path.dirname(path_file), data["data"])
+
+
+def rename_path(path_file: str, new_path: str) -> None:
+    """
+    Renomeia um caminho gravado. Num caminho binário o .bin é renomeado
+    junto e o cabeçalho passa a apontar para o novo nome.
+    
+    Args:
+        path_file: Arquivo .json atual do caminho
+        new_path: Novo arquivo .json (o .bin fica ao lado, com o mesmo nome)
+    """
+    bin_path = binary_data_file(path_file)
+    if bin_path is None:
+        os.rename(path_file, new_path)
+        return
+    
+    header = _read_json(path_file)
+    new_bin = os.path.splitext(new_path)[0] + ".bin"
+    os.replace(bin_path, new_bin)
+    header["data"] = os.path.basename(new_bin)
+    with open(new_path, 'w', encoding='utf-8') as f:
+        json.dump(header, f, indent=2)
+    
+    # Cabeçalho antigo removido por último (a menos que o nome seja o mesmo)
+    if os.path.normcase(os.path.abspath(new_path)) != os.path.normcase(os.path.abspath(path_file)):
+        os.remove(path_file)